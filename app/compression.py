@@ -0,0 +1,122 @@
+import gzip
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted(accept_encoding: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_q:
+            best, best_q = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _with_vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    vary = [v for k, v in headers if k.lower() == b"vary"]
+    if any(b"accept-encoding" in v.lower() for v in vary):
+        return headers
+    return [*headers, (b"vary", b"Accept-Encoding")]
+
+
+def _weak_etag(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    # Encoded bodies differ byte for byte, so they can only share a weak validator.
+    return [(k, b"W/" + v if k.lower() == b"etag" and not v.startswith(b"W/") else v) for k, v in headers]
+
+
+class CompressionMiddleware:
+    def __init__(self, app: Any, minimum_size: int = MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        start_message: dict[str, Any] | None = None
+        streaming = False
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal start_message, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            if streaming:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_headers = [(k, v) for k, v in start_message.get("headers", [])]
+            names = {k.lower() for k, _ in response_headers}
+            content_type = next((v for k, v in response_headers if k.lower() == b"content-type"), b"").decode("latin-1")
+            eligible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and b"content-encoding" not in names
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if start_message.get("status") == 304 and encoding is not None:
+                # Revalidations must echo the validator the client got with the compressed body.
+                await send({**start_message, "headers": _with_vary(_weak_etag(response_headers))})
+                await send(message)
+                return
+            if not eligible:
+                # Streaming or small responses pass through untouched.
+                streaming = message.get("more_body", False)
+                await send(start_message)
+                await send(message)
+                return
+            if encoding is None:
+                # Identity variant of a compressible body: shared caches must still key on the encoding.
+                await send({**start_message, "headers": _with_vary(response_headers)})
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            response_headers = [(k, v) for k, v in response_headers if k.lower() != b"content-length"]
+            response_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ]
+            await send({**start_message, "headers": _with_vary(_weak_etag(response_headers))})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
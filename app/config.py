@@ -15,6 +15,60 @@ class Settings:
     )
     openai_ssl_verify: bool = os.getenv("OPENAI_SSL_VERIFY", "true").lower() != "false"
     app_api_key: str | None = os.getenv("APP_API_KEY")
+    mcp_hedging: bool = os.getenv("MCP_HEDGING", "true").lower() != "false"
+    step4_page_concurrency: int = int(os.getenv("STEP4_PAGE_CONCURRENCY", "4"))
+    step4_pagination_reprompt: bool = os.getenv("STEP4_PAGINATION_REPROMPT", "false").lower() == "true"
+    mirror_path: str = os.getenv("MOSPI_MIRROR_PATH", "mospi_mirror.sqlite3")
+    mirror_slices_path: str = os.getenv("MOSPI_MIRROR_SLICES", "mirror_slices.json")
+    mirror_max_age_hours: float = float(os.getenv("MOSPI_MIRROR_MAX_AGE_HOURS", "24"))
+    cache_ttl_seconds: float = float(os.getenv("CACHE_TTL_SECONDS", "21600"))
+    warm_claims_path: str = os.getenv("WARM_CLAIMS_PATH", "warm_claims.json")
+    prewarm_enabled: bool = os.getenv("PREWARM_ENABLED", "false").lower() == "true"
+    prewarm_interval_seconds: float = float(os.getenv("PREWARM_INTERVAL_SECONDS", "18000"))
+    prewarm_pause_seconds: float = float(os.getenv("PREWARM_PAUSE_SECONDS", "2"))
+    prewarm_max_live_requests: int = int(os.getenv("PREWARM_MAX_LIVE_REQUESTS", "2"))
+    llm_small_model: str = os.getenv("LLM_SMALL_MODEL", "gpt-4.1-mini")
+    llm_large_model: str = os.getenv("LLM_LARGE_MODEL", "gpt-4.1")
+    llm_small_max_tokens: int = int(os.getenv("LLM_SMALL_MAX_TOKENS", "2000"))
+    llm_large_min_tokens: int = int(os.getenv("LLM_LARGE_MIN_TOKENS", "60000"))
+    llm_latency_budget_seconds: float = float(os.getenv("LLM_LATENCY_BUDGET_SECONDS", "20"))
+    llm_max_error_rate: float = float(os.getenv("LLM_MAX_ERROR_RATE", "0.5"))
+    snapshot_path: str = os.getenv("MOSPI_SNAPSHOT_PATH", "mospi_catalog.snap")
+    verdict_store_path: str = os.getenv("VERDICT_STORE_PATH", "verdicts.sqlite3")
+    verdict_store_max_rows: int = int(os.getenv("VERDICT_STORE_MAX_ROWS", "50000"))
+    claims_max_concurrency: int = int(os.getenv("CLAIMS_MAX_CONCURRENCY", "8"))
+    claims_max_queue: int = int(os.getenv("CLAIMS_MAX_QUEUE", "32"))
+    claims_queue_slo_seconds: float = float(os.getenv("CLAIMS_QUEUE_SLO_SECONDS", "20"))
+    claim_deadline_seconds: float = float(os.getenv("CLAIM_DEADLINE_SECONDS", "20"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    mcp_max_concurrency: int = int(os.getenv("MCP_MAX_CONCURRENCY", "32"))
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    rate_limit_path: str = os.getenv("RATE_LIMIT_PATH", "rate_limits.sqlite3")
+    rate_limit_window_seconds: float = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600"))
+    rate_limit_per_ip: int = int(os.getenv("RATE_LIMIT_PER_IP", "20"))
+    rate_limit_per_key: int = int(os.getenv("RATE_LIMIT_PER_KEY", "1000"))
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+    rate_limit_busy_timeout_ms: float = float(os.getenv("RATE_LIMIT_BUSY_TIMEOUT_MS", "250"))
+    chart_max_points: int = int(os.getenv("CHART_MAX_POINTS", "60"))
+    interpreter_max_points: int = int(os.getenv("INTERPRETER_MAX_POINTS", "36"))
+    rule_filters: bool = os.getenv("RULE_FILTERS", "true").lower() != "false"
+    decision_cache_ttl_seconds: int = int(os.getenv("DECISION_CACHE_TTL_SECONDS", "21600"))
+    decision_cache_max_entries: int = int(os.getenv("DECISION_CACHE_MAX_ENTRIES", "2048"))
+    refresh_enabled: bool = os.getenv("REFRESH_ENABLED", "false").lower() == "true"
+    release_cadences_path: str = os.getenv("MOSPI_RELEASE_CADENCES", "release_cadences.json")
+    refresh_check_interval_seconds: float = float(os.getenv("REFRESH_CHECK_INTERVAL_SECONDS", "900"))
+    refresh_grace_hours: float = float(os.getenv("REFRESH_GRACE_HOURS", "2"))
+    refresh_recheck_hours: float = float(os.getenv("REFRESH_RECHECK_HOURS", "12"))
+    refresh_recheck_days: float = float(os.getenv("REFRESH_RECHECK_DAYS", "3"))
+    refresh_max_per_round: int = int(os.getenv("REFRESH_MAX_PER_ROUND", "40"))
+    refresh_min_interval_seconds: float = float(os.getenv("REFRESH_MIN_INTERVAL_SECONDS", "2"))
+    refresh_cache_ttl_seconds: float = float(os.getenv("REFRESH_CACHE_TTL_SECONDS", "604800"))
+    loop_monitor_enabled: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() != "false"
+    loop_stall_threshold_ms: float = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+    # Measured: the hop to a worker costs ~70us, while rule scoring 200 rows takes ~1.5ms on the loop.
+    offload_min_rows: int = int(os.getenv("OFFLOAD_MIN_ROWS", "200"))
+    offload_workers: int = int(os.getenv("OFFLOAD_WORKERS", "4"))
+    rule_verdicts: bool = os.getenv("RULE_VERDICTS", "true").lower() != "false"
 
 
 settings = Settings()
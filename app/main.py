@@ -1,10 +1,52 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+from contextlib import asynccontextmanager
 
-from app.config import settings
-from app.routers.claims import router as claims_router
+from app import startup
 
-app = FastAPI()
+with startup.phase("fastapi"):
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+
+with startup.phase("app.config"):
+    from app.compression import CompressionMiddleware
+    from app.config import settings
+
+with startup.phase("app.routers.claims"):
+    from app.routers.claims import live_requests, refetch_cached, resolve_claim, router as claims_router
+
+with startup.phase("app.services"):
+    from app.services import admission, metrics
+    from app.services.circuit_breaker import mcp_endpoints
+    from app.services.decision_cache import decisions
+    from app.services.fastjson import FastJSONResponse
+    from app.services.filter_rules import bypass_stats
+    from app.services.latency import tool_latency
+    from app.services.llm import model_router
+    from app.services.loop_monitor import loop_monitor
+    from app.services.mcp_client import _configured_urls
+    from app.services.prewarm import prewarm_forever
+    from app.services.refresh import refresh_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup.log_report()
+    tasks = [asyncio.create_task(mcp_endpoints.probe_forever(_configured_urls()))]
+    if settings.loop_monitor_enabled:
+        tasks.append(asyncio.create_task(loop_monitor.run()))
+    if settings.prewarm_enabled:
+        tasks.append(asyncio.create_task(prewarm_forever(resolve_claim, live_requests)))
+    if settings.refresh_enabled:
+        tasks.append(asyncio.create_task(refresh_scheduler.refresh_forever(refetch_cached, live_requests)))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+with startup.phase("app.create"):
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 allow_origins = settings.allow_origins
 if allow_origins == ["*"]:
@@ -20,9 +62,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(claims_router)
 
 
+@app.middleware("http")
+async def track_first_request(request: Request, call_next):
+    response = await call_next(request)
+    startup.mark_first_request()
+    return response
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "mcp": mcp_endpoints.snapshot()}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        **metrics.snapshot(),
+        "mcp_tools": tool_latency.snapshot(),
+        "llm_models": model_router.snapshot(),
+        "admission": admission.snapshot(),
+        "selector_b": bypass_stats(),
+        "selector_decisions": decisions.stats(),
+        "cache_refresh": refresh_scheduler.snapshot(),
+        "event_loop": loop_monitor.snapshot(),
+        "startup": startup.report(),
+    }
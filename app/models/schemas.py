@@ -1,6 +1,8 @@
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.services.preview import RawPreview
 
 
 class ClaimRequest(BaseModel):
@@ -21,6 +23,11 @@ class MCPStep(BaseModel):
     time: str
     rawJson: str
 
+    @field_validator("rawJson", mode="before")
+    @classmethod
+    def _render_preview(cls, value: Any) -> Any:
+        return str(value) if isinstance(value, RawPreview) else value
+
 
 class VerdictData(BaseModel):
     verdict: Literal["busted", "confirmed", "complicated"]
@@ -29,6 +36,7 @@ class VerdictData(BaseModel):
     chartData: list[ChartDataPoint]
     source: str
     mcpSteps: list[MCPStep]
+    verdictId: str | None = None
 
 
 class OutOfScopeResponse(BaseModel):
@@ -42,3 +50,38 @@ class OutOfScopeResponse(BaseModel):
 class ErrorResponse(BaseModel):
     error: bool = True
     message: str
+
+
+ClaimType = Literal["trend", "level", "comparison", "distribution", "compound", "intra_comparison", "other"]
+
+
+class SelectorAOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    dataset: str | None = None
+    params: dict[str, str] = Field(default_factory=dict)
+    claim_type: ClaimType = "trend"
+    reasoning: str | None = None
+
+
+class SelectorBOutput(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    dataset: str | None = None
+    filters: dict[str, str]
+    benchmark_filters: dict[str, str] | None = None
+    optional_drop_filters: list[str] = Field(default_factory=list)
+    reasoning: str | None = None
+
+
+class InterpretationOutput(BaseModel):
+    verdict: Literal["busted", "confirmed", "complicated"]
+    headlineStat: str = Field(..., min_length=1)
+    explanation: str = Field(..., min_length=1)
+    chartData: list[ChartDataPoint]
+    source: str = Field(..., min_length=1)
+
+
+class ExplanationOutput(BaseModel):
+    explanation: str = Field(..., min_length=1)
+    source: str = Field(..., min_length=1)
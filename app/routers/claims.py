@@ -1,65 +1,222 @@
-import json
 import asyncio
 import logging
 import os
 import time
-import re
-from typing import Any
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Literal
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
-from fastmcp import Client
+from fastapi.responses import Response
 
 from app.config import settings
 from app.models.schemas import ClaimRequest, ErrorResponse, OutOfScopeResponse, VerdictData
+from app.services import fastjson, metrics, offload
+from app.services.admission import AdmissionRejected, claim_admission, mcp_slots
+from app.services.cache import TTLCache
+from app.services.checkpoint import PipelineCheckpoint
+from app.services.circuit_breaker import mcp_endpoints
 from app.services.classifier import classify_claim
-from app.services.interpreter import interpret_claim
-from app.services.mcp_client import MCPClientError, _truncate_raw
+from app.services.deadline import DeadlineExceeded, budget, request_deadline, within_deadline
+from app.services.fastjson import FastJSONResponse
+from app.services.filter_rules import record_rule_miss, rule_filters
+from app.services.interpreter import explain_verdict, interpret_claim
+from app.services.latency import tool_latency
+from app.services.mcp_client import MCPClientError, _candidate_urls, open_client
+from app.services.mirror import get_mirror
+from app.services.normalizer import SeriesAccumulator, downsample_rows, lttb
+from app.services.offload import row_count
+from app.services.preview import STEP4_PRIORITY_KEYS, RawPreview
+from app.services.rate_limit import rate_limiter
+from app.services.refresh import refresh_scheduler
 from app.services.selector_a import select_indicator_params
 from app.services.selector_b import select_filters
+from app.services.snapshot import get_snapshot
+from app.services.step4_planner import PlannedCall, plan_step4, route_rows
+from app.services.time_scope import TimeScope, apply_time_scope, parse_time_scope
+from app.services.verdict_engine import evaluate_claim, full_chart
+from app.services.verdict_store import verdict_store
+
+if TYPE_CHECKING:
+    from fastmcp import Client
 
 router = APIRouter()
 logger = logging.getLogger("app.claims")
 DEBUG_LOG = os.getenv("DEBUG_CLAIM_LOG", "false").lower() == "true"
-YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
-REL_TIME_RE = re.compile(r"\b(years ago|decade|decades|since|in the \d{2}s)\b", re.IGNORECASE)
 MCP_CALL_TIMEOUT = 30.0
+# All MoSPI tools are read-only, so a slow call can safely be duplicated.
+IDEMPOTENT_TOOLS = {"1_know_about_mospi_api", "2_get_indicators", "3_get_metadata", "4_get_data"}
+MCP_STAGES = {"connect", "step1", "step2", "step3"}
+CACHEABLE_TOOLS = {"2_get_indicators", "3_get_metadata", "4_get_data"}
+CATALOG_TOOLS = {"2_get_indicators", "3_get_metadata"}
+_HEDGE_URL: ContextVar[str | None] = ContextVar("hedge_url", default=None)
+STEP4_MAX_PAGES = 20
+VERDICT_CACHE_CONTROL = "public, max-age=86400, s-maxage=31536000, immutable"
 
+Detail = Literal["summary", "full"]
 
-def _write_debug(name: str, payload: Any) -> None:
-    if not DEBUG_LOG:
-        return
+
+def _dump_debug(name: str, payload: Any) -> None:
     try:
-        with open(name, "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, ensure_ascii=False, indent=2)
+        with open(name, "wb") as handle:
+            handle.write(fastjson.dumps_bytes(payload, indent=True))
     except Exception:
         logger.exception("Failed to write debug file: %s", name)
 
-_RATE_WINDOW = 3600
-_RATE_LIMIT = 20
-_RATE_STATE: dict[str, tuple[int, float]] = {}
+
+def _write_debug(name: str, payload: Any) -> None:
+    if not DEBUG_LOG:
+        return
+    # Indented dumps of Step-3/4 payloads plus file I/O stay off the event loop.
+    offload.submit(_dump_debug, name, payload)
 
 _STEP1_CACHE: dict[str, Any] | None = None
+# With release-driven revalidation the flat TTL is only a backstop for entries nobody refreshes.
+_MCP_CACHE = TTLCache(
+    max_entries=512,
+    ttl=settings.refresh_cache_ttl_seconds if settings.refresh_enabled else settings.cache_ttl_seconds,
+)
+_VERDICT_CACHE = TTLCache(max_entries=1024, ttl=settings.cache_ttl_seconds)
+_IN_FLIGHT = 0
 
 
-def _rate_limit(ip: str) -> bool:
-    now = time.time()
-    count, start = _RATE_STATE.get(ip, (0, now))
-    if now - start >= _RATE_WINDOW:
-        _RATE_STATE[ip] = (1, now)
+def _payload(result: Any) -> Any:
+    return getattr(result, "structured_content", None) or getattr(result, "data", None) or result
+
+
+def _cacheable(result: Any) -> bool:
+    # Errors and empty answers are retried on the next claim instead of being pinned for the cache TTL.
+    if getattr(result, "is_error", False):
+        return False
+    payload = _payload(result)
+    if not payload:
         return False
-    if count >= _RATE_LIMIT:
-        return True
-    _RATE_STATE[ip] = (count + 1, start)
-    return False
+    if isinstance(payload, dict):
+        if payload.get("error") or payload.get("statusCode") is False:
+            return False
+        if "data" in payload and not payload["data"]:
+            return False
+    return True
 
 
-def _payload(result: Any) -> Any:
-    return getattr(result, "structured_content", None) or getattr(result, "data", None) or result
+async def _call_on(url: str | None, client: "Client", tool: str, payload: dict[str, Any]) -> Any:
+    if url is None:
+        return await client.call_tool(tool, payload)
+    async with open_client(url) as alternate:
+        return await alternate.call_tool(tool, payload)
+
+
+async def _hedged_call(client: "Client", tool: str, payload: dict[str, Any], hedge_after: float) -> Any:
+    primary = asyncio.create_task(client.call_tool(tool, payload))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return primary.result()
+        logger.info("MCP hedge tool=%s after=%.2fs", tool, hedge_after)
+        tasks.add(asyncio.create_task(_call_on(_HEDGE_URL.get(), client, tool, payload)))
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait for the losers so the alternate endpoint's connection is closed before returning.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _tool_key(tool: str, payload: dict[str, Any]) -> str:
+    return f"{tool}:{fastjson.dumps(payload, sort_keys=True)}"
 
 
-async def _call_tool_with_timeout(client: Client, tool: str, payload: dict[str, Any]) -> Any:
-    return await asyncio.wait_for(client.call_tool(tool, payload), timeout=MCP_CALL_TIMEOUT)
+def _step4_key(dataset: str, filters: dict[str, Any]) -> str:
+    return _tool_key("4_get_data", {"dataset": dataset, "filters": filters})
+
+
+def _cached_step1() -> Any:
+    if _STEP1_CACHE is not None:
+        return _STEP1_CACHE
+    snapshot = get_snapshot()
+    return snapshot.get(_tool_key("1_know_about_mospi_api", {})) if snapshot is not None else None
+
+
+def export_catalogs() -> dict[str, Any]:
+    entries: dict[str, Any] = {}
+    if _STEP1_CACHE is not None:
+        entries[_tool_key("1_know_about_mospi_api", {})] = _STEP1_CACHE
+    for key, result in _MCP_CACHE.items():
+        if key.split(":", 1)[0] in CATALOG_TOOLS:
+            entries[key] = _payload(result)
+    return entries
+
+
+async def _call_tool_with_timeout(client: "Client", tool: str, payload: dict[str, Any]) -> Any:
+    cache_key = _tool_key(tool, payload) if tool in CACHEABLE_TOOLS else None
+    if cache_key is not None:
+        cached = _MCP_CACHE.get(cache_key)
+        if cached is not None and not refresh_scheduler.is_stale(cache_key):
+            return cached
+        if cached is not None:
+            # Something newer was released; the snapshot is older still, so go upstream.
+            metrics.incr("mcp_cache_stale", tool=tool)
+        else:
+            # Catalog metadata is shared across workers through the snapshot; it is not copied into
+            # the per-process cache.
+            snapshot = get_snapshot() if tool in CATALOG_TOOLS else None
+            shared = snapshot.get(cache_key) if snapshot is not None else None
+            if shared is not None and not refresh_scheduler.released_since(payload.get("dataset"), snapshot.built_at):
+                return shared
+            if shared is not None:
+                metrics.incr("mcp_cache_stale", tool=tool)
+    result = await _call_tool_uncached(client, tool, payload)
+    if cache_key is not None and _cacheable(result):
+        _MCP_CACHE.set(cache_key, result)
+        await refresh_scheduler.track(cache_key, tool, payload, _payload(result))
+    return result
+
+
+async def refetch_cached(cache_key: str, tool: str, payload: dict[str, Any]) -> Any | None:
+    # Background revalidation for the refresh scheduler; only entries still in the cache are worth a call.
+    if _MCP_CACHE.get(cache_key) is None:
+        return None
+    urls = _candidate_urls()
+    if not urls:
+        raise MCPClientError("No MCP endpoint available")
+    async with open_client(urls[0]) as client:
+        result = await _call_tool_uncached(client, tool, payload)
+    if not _cacheable(result):
+        # Keep serving the last good payload; the scheduler counts this as a failed check.
+        raise MCPClientError(f"Refresh of {tool} returned an error or empty payload")
+    _MCP_CACHE.set(cache_key, result)
+    return _payload(result)
+
+
+async def _call_tool_uncached(client: "Client", tool: str, payload: dict[str, Any]) -> Any:
+    timeout = tool_latency.timeout_for(tool, MCP_CALL_TIMEOUT)
+    hedge_after = tool_latency.hedge_delay(tool) if settings.mcp_hedging and tool in IDEMPOTENT_TOOLS else None
+    # Waiting for a slot spends the same request budget as the call itself.
+    async with within_deadline(tool), mcp_slots.slot():
+        start = time.perf_counter()
+        try:
+            # The per-tool timeout is further capped by what is left of the request's deadline.
+            async with within_deadline(tool, timeout):
+                if hedge_after is None:
+                    result = await client.call_tool(tool, payload)
+                else:
+                    result = await _hedged_call(client, tool, payload, hedge_after)
+        except DeadlineExceeded:
+            raise
+        except asyncio.TimeoutError:
+            # Count timeouts at the cap so the percentiles move up when the server slows down.
+            tool_latency.record(tool, timeout)
+            raise
+        tool_latency.record(tool, time.perf_counter() - start)
+    return result
 
 
 def _log_step_duration(step: str, duration: float) -> None:
@@ -142,91 +299,721 @@ def _expand_filters(filters: dict[str, Any], max_years: int = 5) -> list[dict[st
     return expanded
 
 
+def _time_values(filters: dict[str, Any]) -> dict[str, str]:
+    return {
+        key: str(value)
+        for key, value in filters.items()
+        if ("year" in key.lower() and key.lower() != "base_year") or key.lower() in {"month_code", "month"}
+    }
+
+
+def _split_time_values(value: Any) -> list[str]:
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+def _needed_periods(filters: dict[str, Any]) -> set[str]:
+    years: list[str] = []
+    months: list[str] = []
+    for key, value in filters.items():
+        key_lower = key.lower()
+        if "year" in key_lower and key_lower != "base_year":
+            years = [part[:4] for part in _split_time_values(value) if part[:4].isdigit()]
+        elif key_lower in {"month_code", "month"}:
+            months = [f"{int(part):02d}" for part in _split_time_values(value) if part.isdigit()]
+    if months:
+        return {f"{year}-{month}" for year in years for month in months}
+    return set(years)
+
+
+def _total_pages(payload: Any) -> int:
+    meta = payload.get("meta_data") if isinstance(payload, dict) else None
+    if not isinstance(meta, dict):
+        return 1
+    try:
+        return int(meta.get("totalPages", 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+async def _fetch_remaining_pages(
+    client: "Client",
+    dataset: str,
+    one_filter: dict[str, Any],
+    total_pages: int,
+    accumulator: SeriesAccumulator,
+) -> tuple[int, bool]:
+    last_page = min(total_pages, STEP4_MAX_PAGES)
+    semaphore = asyncio.Semaphore(settings.step4_page_concurrency)
+
+    async def _fetch(page: int) -> tuple[int, Any]:
+        async with semaphore:
+            result = await _call_tool_with_timeout(
+                client,
+                "4_get_data",
+                {"dataset": dataset, "filters": {**one_filter, "page": str(page)}},
+            )
+            return page, _payload(result)
+
+    tasks = [asyncio.create_task(_fetch(page)) for page in range(2, last_page + 1)]
+    # Pages are added strictly in index order so the early stop depends on page contents, not on
+    # which request happened to finish first.
+    completed: dict[int, Any] = {}
+    fetched = 1
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            page, payload = await next_done
+            completed[page] = payload
+            while fetched + 1 in completed and not accumulator.covers_needed():
+                fetched += 1
+                accumulator.add(completed.pop(fetched), order=fetched)
+            if accumulator.covers_needed():
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    truncated = fetched < total_pages and not accumulator.covers_needed()
+    return fetched, truncated
+
+
+async def _fetch_step4_call(
+    client: "Client",
+    dataset: str,
+    one_filter: dict[str, Any],
+    description: str,
+    debug_name: str,
+) -> tuple[list[dict[str, Any]], bool, dict[str, Any]]:
+    start = time.perf_counter()
+    mirror = get_mirror()
+    # SQLite lookups and row decoding stay off the event loop.
+    payload = await asyncio.to_thread(mirror.query, dataset, one_filter) if mirror is not None else None
+    from_mirror = payload is not None
+    if not from_mirror:
+        result = await _call_tool_with_timeout(
+            client,
+            "4_get_data",
+            {"dataset": dataset, "filters": one_filter},
+        )
+        payload = _payload(result)
+        if mirror is not None and isinstance(payload, dict) and payload.get("data"):
+            offload.submit(mirror.note_slice, dataset, one_filter)
+    _write_debug(f"{debug_name}.json", payload)
+    _write_debug(f"{debug_name}_filters.json", one_filter)
+    chunk = SeriesAccumulator(_needed_periods(one_filter))
+    chunk.add(payload)
+    if from_mirror:
+        description += ", local mirror"
+    paginated = False
+    total_pages = _total_pages(payload)
+    if total_pages > 1:
+        if "page" in one_filter and one_filter.get("page") == "1":
+            pages, paginated = await _fetch_remaining_pages(client, dataset, one_filter, total_pages, chunk)
+            description += f", {pages}/{total_pages} pages"
+        else:
+            paginated = True
+    duration = time.perf_counter() - start
+    step = {
+        "id": 4,
+        "name": "Fetch",
+        "description": description,
+        "result": payload.get("msg", "Data retrieved") if isinstance(payload, dict) else "Data retrieved",
+        "time": f"{duration:.2f}s",
+        "rawJson": RawPreview(payload, priority=STEP4_PRIORITY_KEYS),
+    }
+    return chunk.rows, paginated, step
+
+
+async def _run_step4_plan(
+    client: "Client",
+    dataset: str,
+    requests: dict[str, dict[str, Any]],
+    attempt: str,
+    step4_steps: list[dict[str, Any]],
+    param_names: set[str],
+    executed: dict[str, tuple[dict[str, Any], list[dict[str, Any]], bool]],
+) -> dict[str, tuple[list[dict[str, Any]], bool]]:
+    expanded: dict[str, list[dict[str, Any]]] = {}
+    for label, filters in requests.items():
+        base_filters = dict(filters)
+        if "limit" in param_names and "limit" not in base_filters:
+            base_filters["limit"] = "100"
+        if "page" in param_names and "page" not in base_filters:
+            base_filters["page"] = "1"
+        expanded[label] = _expand_filters(base_filters)
+
+    plan = plan_step4(expanded, [filters for filters, _, _ in executed.values()])
+    logical = sum(len(filter_sets) for filter_sets in expanded.values())
+    pending = [call for call in plan if not call.done]
+    metrics.incr("step4_calls", logical, kind="logical")
+    metrics.incr("step4_calls", len(pending), kind="issued")
+    logger.info("Step-4 plan attempt=%s logical=%d planned=%d issued=%d", attempt, logical, len(plan), len(pending))
+
+    steps: dict[int, dict[str, Any]] = {}
+
+    async def _execute(idx: int, call: PlannedCall) -> None:
+        labels = ", ".join(sorted({label for label, _ in call.targets}))
+        if attempt == "retry":
+            labels += ", retry"
+        start = time.perf_counter()
+        rows, paginated, step = await _fetch_step4_call(
+            client,
+            dataset,
+            call.filters,
+            f"Fetched data for {dataset} ({labels})",
+            f"debug_step4_{attempt}_{idx}",
+        )
+        _log_step_duration(f"step4_{attempt}", time.perf_counter() - start)
+        # Checkpointed as soon as it lands, so a retry after a sibling fails only refetches what is missing.
+        executed[_step4_key(dataset, call.filters)] = (call.filters, rows, paginated)
+        steps[idx] = step
+
+    tasks = [asyncio.create_task(_execute(idx, call)) for idx, call in enumerate(pending)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # One failed call ends the phase; its siblings must not keep using a client being torn down.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        step4_steps.extend(steps[idx] for idx in sorted(steps))
+
+    by_label: dict[str, tuple[SeriesAccumulator, bool]] = {
+        label: (SeriesAccumulator(), False) for label in requests
+    }
+    for call in plan:
+        _, rows, paginated = executed[_step4_key(dataset, call.filters)]
+        for label, index in call.targets:
+            accumulator, label_paginated = by_label[label]
+            accumulator.add(route_rows(rows, expanded[label][index], call.filters), order=index)
+            by_label[label] = (accumulator, label_paginated or paginated)
+    return {label: (accumulator.rows, paginated) for label, (accumulator, paginated) in by_label.items()}
+
+
 async def _run_step4(
-    client: Client,
+    client: "Client",
     dataset: str,
-    filters: dict[str, Any],
+    requests: dict[str, dict[str, Any]],
     step4_steps: list[dict[str, Any]],
-    label: str,
     optional_drop_filters: list[str],
     step3_payload: dict[str, Any],
-) -> tuple[list[dict[str, Any]], bool]:
+    executed: dict[str, tuple[dict[str, Any], list[dict[str, Any]], bool]],
+) -> dict[str, tuple[list[dict[str, Any]], bool]]:
     api_params = step3_payload.get("api_params", []) if isinstance(step3_payload, dict) else []
     param_names = {p.get("name") for p in api_params if p.get("name")}
 
-    async def _call(
-        filters_to_use: dict[str, Any],
-        attempt: str,
-    ) -> tuple[list[dict[str, Any]], bool]:
-        rows: list[dict[str, Any]] = []
-        paginated = False
-        base_filters = dict(filters_to_use)
-        if "limit" in param_names and "limit" not in base_filters:
-            base_filters["limit"] = "100"
-        if "page" in param_names and "page" not in base_filters:
-            base_filters["page"] = "1"
+    # Every series of this phase is planned together so shared slices are fetched once.
+    results = await _run_step4_plan(client, dataset, requests, "fetch", step4_steps, param_names, executed)
 
-        for idx, one_filter in enumerate(_expand_filters(base_filters)):
-            start = time.perf_counter()
-            result = await _call_tool_with_timeout(
-                client,
-                "4_get_data",
-                {"dataset": dataset, "filters": one_filter},
+    # One retry for empty series: drop optional filters (max 3), but never required
+    required = {p["name"] for p in api_params if p.get("required")}
+    retries: dict[str, dict[str, Any]] = {}
+    for label, filters in requests.items():
+        if results[label][0]:
+            continue
+        drops = [k for k in optional_drop_filters if k in filters and k not in required][:3]
+        if drops:
+            retries[label] = {k: v for k, v in filters.items() if k not in drops}
+    if retries:
+        results.update(
+            await _run_step4_plan(client, dataset, retries, "retry", step4_steps, param_names, executed)
+        )
+    return results
+
+
+async def _checkpointed_step4(
+    client: "Client",
+    checkpoint: PipelineCheckpoint,
+    requests: dict[str, dict[str, Any]],
+    dataset: str,
+    optional_drop_filters: list[str],
+    step3_payload: dict[str, Any],
+) -> dict[str, tuple[list[dict[str, Any]], bool]]:
+    pending = {label: filters for label, filters in requests.items() if label not in checkpoint.step4}
+    if pending:
+        checkpoint.stage = f"step4_{'+'.join(pending)}"
+        step4_steps: list[dict[str, Any]] = []
+        try:
+            checkpoint.step4.update(
+                await _run_step4(
+                    client,
+                    dataset,
+                    pending,
+                    step4_steps,
+                    optional_drop_filters,
+                    step3_payload,
+                    checkpoint.step4_calls,
+                )
             )
+        finally:
+            # Calls that completed before a failure are checkpointed; keep their steps too.
+            checkpoint.steps.extend(step4_steps)
+    # Callers read results by series ("primary"/"benchmark") whatever phase suffix they ran under.
+    return {label.split("_")[0]: checkpoint.step4[label] for label in requests}
+
+
+def _step4_requests(
+    filters: dict[str, Any], benchmark_filters: dict[str, Any] | None, suffix: str = ""
+) -> dict[str, dict[str, Any]]:
+    requests = {f"primary{suffix}": filters}
+    if isinstance(benchmark_filters, dict) and benchmark_filters:
+        requests[f"benchmark{suffix}"] = benchmark_filters
+    return requests
+
+
+def _downsample_for_llm(normalized: Any) -> Any:
+    budget = settings.interpreter_max_points
+    if isinstance(normalized, dict):
+        primary = downsample_rows(normalized["primary"], budget)
+        benchmark = downsample_rows(normalized["benchmark"], budget)
+        if primary is normalized["primary"] and benchmark is normalized["benchmark"]:
+            return normalized
+        return {**normalized, "primary": primary, "benchmark": benchmark}
+    return downsample_rows(normalized, budget)
+
+
+def _filters_from_selector_b(
+    selector_b: dict[str, Any],
+    claim_type: str,
+    step3_payload: dict[str, Any],
+    time_scope: TimeScope | None = None,
+) -> tuple[dict[str, Any], dict[str, Any] | None, list[str]]:
+    selected = _clean_filters(selector_b.get("filters", {}), step3_payload)
+    # Years the claim names are pinned here rather than trusted to the prompt's "latest 3 years" rule.
+    filters = apply_time_scope(selected, time_scope, step3_payload)
+    benchmark_filters = selector_b.get("benchmark_filters")
+    if claim_type not in ("level", "comparison", "intra_comparison"):
+        benchmark_filters = None
+    if isinstance(benchmark_filters, dict):
+        benchmark_filters = _clean_filters(benchmark_filters, step3_payload)
+        if _time_values(benchmark_filters) == _time_values(selected):
+            # A benchmark on a different period is a deliberate time comparison; leave it alone.
+            benchmark_filters = apply_time_scope(benchmark_filters, time_scope, step3_payload)
+    optional_drop_filters = selector_b.get("optional_drop_filters", [])
+    return filters, benchmark_filters, optional_drop_filters
+
+
+async def _run_pipeline(
+    client: "Client | None",
+    claim: str,
+    dataset: str,
+    indicator_hint: str,
+    checkpoint: PipelineCheckpoint,
+) -> VerdictData:
+    global _STEP1_CACHE
+    steps = checkpoint.steps
+    if not checkpoint.step1_done:
+        step1_cached = _cached_step1()
+        if step1_cached is None:
+            checkpoint.stage = "step1"
+            start = time.perf_counter()
+            step1 = await _call_tool_with_timeout(client, "1_know_about_mospi_api", {})
             duration = time.perf_counter() - start
-            _log_step_duration(f"step4_{label}_{attempt}", duration)
-            payload = _payload(result)
-            if isinstance(payload, dict):
-                meta = payload.get("meta_data")
-                if isinstance(meta, dict) and meta.get("totalPages", 1) > 1:
-                    paginated = True
-            _write_debug(f"debug_step4_{label}_{attempt}_{idx}.json", payload)
-            _write_debug(f"debug_step4_{label}_{attempt}_{idx}_filters.json", one_filter)
-            step4_steps.append(
+            _log_step_duration("step1", duration)
+            step1_payload = _payload(step1)
+            _STEP1_CACHE = step1_payload
+            steps.append(
                 {
-                    "id": 4,
-                    "name": "Fetch",
-                    "description": f"Fetched data for {dataset} ({label}, {attempt})",
-                    "result": payload.get("msg", "Data retrieved") if isinstance(payload, dict) else "Data retrieved",
+                    "id": 1,
+                    "name": "Discover",
+                    "description": "Asked MoSPI what datasets are available",
+                    "result": "Dataset overview retrieved",
                     "time": f"{duration:.2f}s",
-                    "rawJson": _truncate_raw(payload),
+                    "rawJson": RawPreview(step1_payload),
                 }
             )
-            if isinstance(payload, dict) and isinstance(payload.get("data"), list):
-                rows.extend(payload.get("data", []))
-        return rows, paginated
+        else:
+            steps.append(
+                {
+                    "id": 1,
+                    "name": "Discover",
+                    "description": "Used cached dataset overview",
+                    "result": "Dataset overview cached",
+                    "time": "0.00s",
+                    "rawJson": RawPreview(step1_cached),
+                }
+            )
+        checkpoint.step1_done = True
 
-    rows, paginated = await _call(filters, "primary")
-    if rows:
-        return rows, paginated
+    if checkpoint.step2_payload is None:
+        checkpoint.stage = "step2"
+        start = time.perf_counter()
+        step2 = await _call_tool_with_timeout(
+            client,
+            "2_get_indicators",
+            {"dataset": dataset, "user_query": indicator_hint},
+        )
+        duration = time.perf_counter() - start
+        _log_step_duration("step2", duration)
+        checkpoint.step2_payload = _payload(step2)
+        steps.append(
+            {
+                "id": 2,
+                "name": "Indicators",
+                "description": f"Found indicators for {dataset}",
+                "result": "Indicator list retrieved",
+                "time": f"{duration:.2f}s",
+                "rawJson": RawPreview(checkpoint.step2_payload),
+            }
+        )
 
-    # One retry: drop optional filters (max 3), but never required
-    api_params = step3_payload.get("api_params", []) if isinstance(step3_payload, dict) else []
-    required = {p["name"] for p in api_params if p.get("required")}
-    drops = [k for k in optional_drop_filters if k in filters and k not in required][:3]
-    if drops:
-        reduced = {k: v for k, v in filters.items() if k not in drops}
-        rows, paginated = await _call(reduced, "retry")
-        return rows, paginated
+    if checkpoint.selector_a is None:
+        checkpoint.stage = "selector_a"
+        checkpoint.selector_a = await select_indicator_params(
+            claim, dataset, checkpoint.step2_payload, indicator_hint=indicator_hint
+        )
+        _write_debug("debug_selector_a_api.json", checkpoint.selector_a)
+    indicator_params = checkpoint.selector_a.get("params", {})
+    claim_type = checkpoint.selector_a.get("claim_type", "trend")
+
+    if checkpoint.step3_payload is None:
+        checkpoint.stage = "step3"
+        start = time.perf_counter()
+        step3 = await _call_tool_with_timeout(
+            client,
+            "3_get_metadata",
+            {"dataset": dataset, **indicator_params},
+        )
+        duration = time.perf_counter() - start
+        _log_step_duration("step3", duration)
+        checkpoint.step3_payload = _payload(step3)
+        steps.append(
+            {
+                "id": 3,
+                "name": "Filters",
+                "description": f"Retrieved valid filters for {dataset}",
+                "result": "Filter metadata retrieved",
+                "time": f"{duration:.2f}s",
+                "rawJson": RawPreview(checkpoint.step3_payload),
+            }
+        )
+    step3_payload = checkpoint.step3_payload
+    time_scope = parse_time_scope(claim)
+
+    if checkpoint.selector_b is None:
+        checkpoint.stage = "selector_b"
+        if settings.rule_filters:
+            checkpoint.selector_b = rule_filters(
+                claim, dataset, claim_type, step3_payload, indicator_params, time_scope
+            )
+        if checkpoint.selector_b is None:
+            checkpoint.selector_b = await select_filters(
+                claim,
+                dataset,
+                claim_type,
+                step3_payload,
+                indicator_params,
+                time_scope=time_scope,
+                indicator_hint=indicator_hint,
+            )
+        _write_debug("debug_selector_b_api.json", checkpoint.selector_b)
+    filters, benchmark_filters, optional_drop_filters = _filters_from_selector_b(
+        checkpoint.selector_b, claim_type, step3_payload, time_scope
+    )
 
-    return [], paginated
+    series = None
+    if checkpoint.selector_b.get("source") == "rules":
+        series = await _checkpointed_step4(
+            client,
+            checkpoint,
+            _step4_requests(filters, benchmark_filters, "_rules"),
+            dataset,
+            optional_drop_filters,
+            step3_payload,
+        )
+        if not series["primary"][0]:
+            # The defaults found nothing; let Selector-B read the metadata properly before giving up.
+            record_rule_miss(dataset)
+            checkpoint.stage = "selector_b"
+            checkpoint.selector_b = await select_filters(
+                claim,
+                dataset,
+                claim_type,
+                step3_payload,
+                indicator_params,
+                time_scope=time_scope,
+                indicator_hint=indicator_hint,
+            )
+            _write_debug("debug_selector_b_api.json", checkpoint.selector_b)
+            filters, benchmark_filters, optional_drop_filters = _filters_from_selector_b(
+                checkpoint.selector_b, claim_type, step3_payload, time_scope
+            )
+            series = None
+    if series is None:
+        series = await _checkpointed_step4(
+            client,
+            checkpoint,
+            _step4_requests(filters, benchmark_filters),
+            dataset,
+            optional_drop_filters,
+            step3_payload,
+        )
+    primary_series, primary_paginated = series["primary"]
+    benchmark_series, benchmark_paginated = series.get("benchmark", (None, False))
+
+    if settings.step4_pagination_reprompt and (primary_paginated or benchmark_paginated):
+        if checkpoint.selector_b_retry is None:
+            checkpoint.stage = "selector_b_retry"
+            checkpoint.selector_b_retry = await select_filters(
+                claim,
+                dataset,
+                claim_type,
+                step3_payload,
+                indicator_params,
+                pagination_hint=(
+                    "Previous Step-4 results were paginated (totalPages>1). "
+                    "Include any aggregation/granularity field (e.g., level) and choose the highest "
+                    "aggregation that still matches the claim. Avoid extra subcategory filters."
+                ),
+                time_scope=time_scope,
+                indicator_hint=indicator_hint,
+            )
+            _write_debug("debug_selector_b_api_retry.json", checkpoint.selector_b_retry)
+        filters, benchmark_filters, optional_drop_filters = _filters_from_selector_b(
+            checkpoint.selector_b_retry, claim_type, step3_payload, time_scope
+        )
+
+        series = await _checkpointed_step4(
+            client,
+            checkpoint,
+            _step4_requests(filters, benchmark_filters, "_retry"),
+            dataset,
+            optional_drop_filters,
+            step3_payload,
+        )
+        primary_series, _ = series["primary"]
+        benchmark_series = series["benchmark"][0] if "benchmark" in series else None
+    checkpoint.mcp_done = True
+
+    if isinstance(benchmark_series, dict) or isinstance(benchmark_series, list):
+        primary_label, benchmark_label = _label_from_filters(filters, benchmark_filters or {})
+        normalized = {
+            "primary_label": primary_label,
+            "benchmark_label": benchmark_label,
+            "primary": primary_series,
+            "benchmark": benchmark_series,
+        }
+    else:
+        normalized = primary_series
+
+    if checkpoint.interpretation is None:
+        rule_verdict = None
+        if settings.rule_verdicts and benchmark_series is None:
+            rule_verdict = await offload.run_sync(
+                "rule_verdict",
+                row_count(primary_series),
+                evaluate_claim,
+                claim,
+                claim_type,
+                primary_series,
+                filters,
+                indicator_hint,
+            )
+
+        if rule_verdict is not None:
+            checkpoint.stage = "explainer"
+            logger.info("Rule verdict=%s basis=%s", rule_verdict["verdict"], rule_verdict["basis"])
+            explanation = await explain_verdict(
+                claim=claim,
+                dataset=dataset,
+                indicator=indicator_hint,
+                verdict=rule_verdict["verdict"],
+                headline_stat=rule_verdict["headlineStat"],
+                chart_data=rule_verdict["chartData"],
+                basis=rule_verdict["basis"],
+                source_hint=f"{dataset} (MoSPI)",
+            )
+            checkpoint.interpretation = {"source": f"{dataset} (MoSPI)", **explanation, **rule_verdict}
+        else:
+            checkpoint.stage = "interpreter"
+            llm_rows = await offload.run_sync("downsample", row_count(normalized), _downsample_for_llm, normalized)
+            interpretation = await interpret_claim(
+                claim=claim,
+                dataset=dataset,
+                indicator=indicator_hint,
+                filters=filters,
+                data_rows=llm_rows,
+                source_hint=f"{dataset} (MoSPI)",
+                claim_type=claim_type,
+            )
+            chart = interpretation.get("chartData") or []
+            if llm_rows is not normalized and chart:
+                # The LLM only saw a thinned series; keep the full-resolution one for detail=full.
+                full = await offload.run_sync(
+                    "full_chart", row_count(primary_series), full_chart, primary_series, filters, chart[0].get("label")
+                )
+                if full and len(full) > len(chart):
+                    interpretation = {**interpretation, "chartData": full}
+            checkpoint.interpretation = interpretation
+
+    checkpoint.stage = "response"
+    try:
+        interpretation = checkpoint.interpretation
+        return VerdictData(
+            verdict=interpretation["verdict"],
+            headlineStat=interpretation["headlineStat"],
+            explanation=interpretation["explanation"],
+            chartData=interpretation["chartData"],
+            source=interpretation["source"],
+            mcpSteps=steps,
+        )
+    except Exception:
+        # A malformed interpretation is the only thing worth recomputing here.
+        checkpoint.interpretation = None
+        raise
 
 
 @router.post("/api/check-claim")
-async def check_claim(request: Request, payload: ClaimRequest):
+async def check_claim(request: Request, payload: ClaimRequest, detail: Detail = "summary"):
     ip = request.client.host if request.client else "unknown"
-    if _rate_limit(ip):
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+    allowed, retry_after = await rate_limiter.check_ip(ip)
+    if not allowed:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded", headers={"Retry-After": str(retry_after)})
     if settings.app_api_key:
         api_key = request.headers.get("x-api-key")
         if not api_key or api_key != settings.app_api_key:
             raise HTTPException(status_code=401, detail="Unauthorized")
+        allowed, retry_after = await rate_limiter.check_api_key(api_key)
+        if not allowed:
+            raise HTTPException(
+                status_code=429, detail="API key quota exceeded", headers={"Retry-After": str(retry_after)}
+            )
+
+    global _IN_FLIGHT
+    _IN_FLIGHT += 1
+    # The task copies the context, so every stage below sees this request's deadline.
+    with request_deadline(settings.claim_deadline_seconds):
+        pipeline = asyncio.create_task(resolve_claim(payload.claim, detail))
+    watcher = asyncio.create_task(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({pipeline, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if pipeline.done():
+            try:
+                return pipeline.result()
+            except AdmissionRejected as exc:
+                return FastJSONResponse(
+                    status_code=503,
+                    content=ErrorResponse(error=True, message="Server busy, please retry").model_dump(),
+                    headers={"Retry-After": str(exc.retry_after)},
+                )
+        # The client aborted; cancel the LLM/MCP task tree instead of finishing work nobody reads.
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+        metrics.incr("claims_disconnected")
+        return Response(status_code=499)
+    finally:
+        watcher.cancel()
+        pipeline.cancel()
+        _IN_FLIGHT -= 1
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    # The body has already been read, so the only message left on the channel is the disconnect.
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+def live_requests() -> int:
+    return _IN_FLIGHT
+
+
+def _chart_view(content: dict[str, Any], detail: Detail) -> dict[str, Any]:
+    # Stored verdicts keep every point; the default view trims long series for the chart.
+    chart = content.get("chartData")
+    if detail == "full" or not isinstance(chart, list) or len(chart) <= settings.chart_max_points:
+        return content
+    return {**content, "chartData": lttb(chart, settings.chart_max_points)}
 
+
+def _verdict_response(content: dict[str, Any], detail: Detail = "summary") -> FastJSONResponse:
+    verdict_id = content.get("verdictId")
+    headers = {"Location": f"/api/verdicts/{verdict_id}"} if verdict_id else None
+    return FastJSONResponse(status_code=200, content=_chart_view(content, detail), headers=headers)
+
+
+def _degraded_response(
+    dataset: str | None, indicator_hint: str | None, checkpoint: PipelineCheckpoint | None, detail: Detail
+) -> FastJSONResponse:
+    # Out of budget: answer "complicated" with whatever Step-4 rows were already fetched.
+    rows = None
+    if checkpoint is not None:
+        rows = next(
+            (rows for label, (rows, _) in reversed(checkpoint.step4.items()) if label.startswith("primary") and rows),
+            None,
+        )
+    chart = (full_chart(rows, None, indicator_hint) or []) if rows else []
+    stage = checkpoint.stage if checkpoint is not None else "classify"
+    metrics.incr("claims_degraded", stage=stage, data=str(bool(chart)).lower())
+    logger.warning("Claim deadline exceeded at stage=%s; returning a degraded verdict", stage)
+    if chart:
+        headline = "Official data found, but the full check ran out of time"
+        explanation = (
+            f"We retrieved the official {dataset} figures shown here but ran out of time before testing the "
+            "claim against them, so we can't call it either way yet. Please try again in a moment."
+        )
+    else:
+        headline = "The check ran out of time"
+        explanation = "We couldn't retrieve the official figures for this claim in time. Please try again in a moment."
+    content = VerdictData(
+        verdict="complicated",
+        headlineStat=headline,
+        explanation=explanation,
+        chartData=chart,
+        source=f"{dataset} (MoSPI)" if dataset else "MoSPI",
+        mcpSteps=checkpoint.steps if checkpoint is not None else [],
+    ).model_dump()
+    # Never cached or stored: a retry with a fresh budget can still produce the real verdict.
+    return FastJSONResponse(
+        status_code=200, content=_chart_view(content, detail), headers={"Cache-Control": "no-store"}
+    )
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [item.strip() for item in if_none_match.split(",")]
+    return "*" in candidates or any(item.removeprefix("W/") == etag for item in candidates)
+
+
+@router.get("/api/verdicts/{verdict_id}")
+async def get_verdict(request: Request, verdict_id: str, detail: Detail = "summary"):
+    content = verdict_store.get(verdict_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Verdict not found")
+    # Verdicts are content-addressed, so the id is a strong validator and never changes.
+    etag = f'"{verdict_id}-full"' if detail == "full" else f'"{verdict_id}"'
+    headers = {"ETag": etag, "Cache-Control": VERDICT_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(status_code=200, content=_chart_view(content, detail), headers=headers)
+
+
+def _claim_key(claim: str) -> str:
+    return " ".join(claim.lower().split()).rstrip(".!?")
+
+
+async def resolve_claim(claim: str, detail: Detail = "summary") -> FastJSONResponse:
+    cache_key = _claim_key(claim)
+    cached = _VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        return _verdict_response(cached, detail)
+    # Cache hits skip the queue; only full pipelines compete for admission.
+    async with claim_admission.admit():
+        return await _resolve_uncached(claim, cache_key, detail)
+
+
+async def _resolve_uncached(claim: str, cache_key: str, detail: Detail) -> FastJSONResponse:
     try:
-        classification = await classify_claim(payload.claim)
+        classification = await classify_claim(claim)
+    except asyncio.CancelledError:
+        metrics.incr("pipeline_cancelled", stage="classify")
+        raise
+    except DeadlineExceeded:
+        return _degraded_response(None, None, None, detail)
     except Exception:
         logger.exception("Classifier failed")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content=ErrorResponse(error=True, message="Classifier failed").model_dump(),
         )
@@ -242,245 +1029,80 @@ async def check_claim(request: Request, payload: ClaimRequest):
             mcpSteps=[],
             outOfScope=True,
         )
-        return JSONResponse(status_code=200, content=out.model_dump())
+        content = out.model_dump()
+        _VERDICT_CACHE.set(cache_key, content)
+        return FastJSONResponse(status_code=200, content=content)
 
     datasets = classification.get("datasets", [])
     if not datasets:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content=ErrorResponse(error=True, message="No dataset selected").model_dump(),
         )
 
     dataset_info = datasets[0]
     dataset = dataset_info.get("dataset")
-    indicator_hint = dataset_info.get("indicator_hint", payload.claim)
+    indicator_hint = dataset_info.get("indicator_hint", claim)
 
-    steps: list[dict[str, Any]] = []
+    checkpoint = PipelineCheckpoint()
     try:
-        for url in [settings.mospi_mcp_url, f"{settings.mospi_mcp_url}/mcp"]:
+        urls = _candidate_urls()
+        for url in urls:
+            _HEDGE_URL.set(next((other for other in urls if other != url), None))
             for attempt, delay in enumerate((0.0, 0.5, 1.0), start=1):
+                if not checkpoint.mcp_done and not mcp_endpoints.allow(url):
+                    break
+                used_endpoint = False
                 try:
-                    current_step = "connect"
-                    async with Client(url) as client:
-                        global _STEP1_CACHE
-                        if _STEP1_CACHE is None:
-                            current_step = "step1"
-                            start = time.perf_counter()
-                            step1 = await _call_tool_with_timeout(client, "1_know_about_mospi_api", {})
-                            duration = time.perf_counter() - start
-                            _log_step_duration("step1", duration)
-                            step1_payload = _payload(step1)
-                            _STEP1_CACHE = step1_payload
-                            steps.append(
-                                {
-                                    "id": 1,
-                                    "name": "Discover",
-                                    "description": "Asked MoSPI what datasets are available",
-                                    "result": "Dataset overview retrieved",
-                                    "time": f"{duration:.2f}s",
-                                    "rawJson": _truncate_raw(step1_payload),
-                                }
-                            )
-                        else:
-                            steps.append(
-                                {
-                                    "id": 1,
-                                    "name": "Discover",
-                                    "description": "Used cached dataset overview",
-                                    "result": "Dataset overview cached",
-                                    "time": "0.00s",
-                                    "rawJson": _truncate_raw(_STEP1_CACHE),
-                                }
-                            )
-
-                        current_step = "step2"
-                        start = time.perf_counter()
-                        step2 = await _call_tool_with_timeout(
-                            client,
-                            "2_get_indicators",
-                            {"dataset": dataset, "user_query": indicator_hint},
-                        )
-                        duration = time.perf_counter() - start
-                        _log_step_duration("step2", duration)
-                        step2_payload = _payload(step2)
-                        steps.append(
-                            {
-                                "id": 2,
-                                "name": "Indicators",
-                                "description": f"Found indicators for {dataset}",
-                                "result": "Indicator list retrieved",
-                                "time": f"{duration:.2f}s",
-                                "rawJson": _truncate_raw(step2_payload),
-                            }
-                        )
-
-                        current_step = "selector_a"
-                        selector_a = await select_indicator_params(payload.claim, dataset, step2_payload)
-                        _write_debug("debug_selector_a_api.json", selector_a)
-                        indicator_params = selector_a.get("params", {})
-                        claim_type = selector_a.get("claim_type", "trend")
-
-                        current_step = "step3"
-                        start = time.perf_counter()
-                        step3 = await _call_tool_with_timeout(
-                            client,
-                            "3_get_metadata",
-                            {"dataset": dataset, **indicator_params},
-                        )
-                        duration = time.perf_counter() - start
-                        _log_step_duration("step3", duration)
-                        step3_payload = _payload(step3)
-                        steps.append(
-                            {
-                                "id": 3,
-                                "name": "Filters",
-                                "description": f"Retrieved valid filters for {dataset}",
-                                "result": "Filter metadata retrieved",
-                                "time": f"{duration:.2f}s",
-                                "rawJson": _truncate_raw(step3_payload),
-                            }
-                        )
-
-                        current_step = "selector_b"
-                        selector_b = await select_filters(
-                            payload.claim,
-                            dataset,
-                            claim_type,
-                            step3_payload,
-                            indicator_params,
-                        )
-                        _write_debug("debug_selector_b_api.json", selector_b)
-
-                        filters = _clean_filters(selector_b.get("filters", {}), step3_payload)
-                        benchmark_filters = selector_b.get("benchmark_filters")
-                        if claim_type not in ("level", "comparison", "intra_comparison"):
-                            benchmark_filters = None
-                        if isinstance(benchmark_filters, dict):
-                            benchmark_filters = _clean_filters(benchmark_filters, step3_payload)
-
-                        optional_drop_filters = selector_b.get("optional_drop_filters", [])
-
-                        step4_steps: list[dict[str, Any]] = []
-                        current_step = "step4_primary"
-                        primary_series, primary_paginated = await _run_step4(
-                            client,
-                            dataset,
-                            filters,
-                            step4_steps,
-                            "primary",
-                            optional_drop_filters,
-                            step3_payload,
-                        )
-
-                        benchmark_series = None
-                        benchmark_paginated = False
-                        if isinstance(benchmark_filters, dict) and benchmark_filters:
-                            current_step = "step4_benchmark"
-                            benchmark_series, benchmark_paginated = await _run_step4(
-                                client,
-                                dataset,
-                                benchmark_filters,
-                                step4_steps,
-                                "benchmark",
-                                optional_drop_filters,
-                                step3_payload,
-                            )
-
-                        if primary_paginated or benchmark_paginated:
-                            current_step = "selector_b_retry"
-                            selector_b = await select_filters(
-                                payload.claim,
-                                dataset,
-                                claim_type,
-                                step3_payload,
-                                indicator_params,
-                                pagination_hint=(
-                                    "Previous Step-4 results were paginated (totalPages>1). "
-                                    "Include any aggregation/granularity field (e.g., level) and choose the highest "
-                                    "aggregation that still matches the claim. Avoid extra subcategory filters."
-                                ),
-                            )
-                            _write_debug("debug_selector_b_api_retry.json", selector_b)
-                            filters = _clean_filters(selector_b.get("filters", {}), step3_payload)
-                            benchmark_filters = selector_b.get("benchmark_filters")
-                            if claim_type not in ("level", "comparison", "intra_comparison"):
-                                benchmark_filters = None
-                            if isinstance(benchmark_filters, dict):
-                                benchmark_filters = _clean_filters(benchmark_filters, step3_payload)
-                            optional_drop_filters = selector_b.get("optional_drop_filters", [])
-
-                            current_step = "step4_primary_retry"
-                            primary_series, _ = await _run_step4(
-                                client,
-                                dataset,
-                                filters,
-                                step4_steps,
-                                "primary_retry",
-                                optional_drop_filters,
-                                step3_payload,
-                            )
-                            if isinstance(benchmark_filters, dict) and benchmark_filters:
-                                current_step = "step4_benchmark_retry"
-                                benchmark_series, _ = await _run_step4(
-                                    client,
-                                    dataset,
-                                    benchmark_filters,
-                                    step4_steps,
-                                    "benchmark_retry",
-                                    optional_drop_filters,
-                                    step3_payload,
-                                )
-                            else:
-                                benchmark_series = None
-
-                        if isinstance(benchmark_series, dict) or isinstance(benchmark_series, list):
-                            primary_label, benchmark_label = _label_from_filters(filters, benchmark_filters or {})
-                            normalized = {
-                                "primary_label": primary_label,
-                                "benchmark_label": benchmark_label,
-                                "primary": primary_series,
-                                "benchmark": benchmark_series,
-                            }
-                        else:
-                            normalized = primary_series
-
-                        steps.extend(step4_steps)
-
-                        current_step = "interpreter"
-                        interpretation = await interpret_claim(
-                            claim=payload.claim,
-                            dataset=dataset,
-                            indicator=indicator_hint,
-                            filters=filters,
-                            data_rows=normalized,
-                            source_hint=f"{dataset} (MoSPI)",
-                        )
-
-                        response = VerdictData(
-                            verdict=interpretation["verdict"],
-                            headlineStat=interpretation["headlineStat"],
-                            explanation=interpretation["explanation"],
-                            chartData=interpretation["chartData"],
-                            source=interpretation["source"],
-                            mcpSteps=steps,
-                        )
-                        return JSONResponse(status_code=200, content=response.model_dump())
-                except MCPClientError:
+                    # Once every MCP payload is checkpointed, a retry no longer needs a connection.
+                    if checkpoint.mcp_done:
+                        response = await _run_pipeline(None, claim, dataset, indicator_hint, checkpoint)
+                    else:
+                        checkpoint.stage = "connect"
+                        used_endpoint = True
+                        async with open_client(url) as client:
+                            response = await _run_pipeline(client, claim, dataset, indicator_hint, checkpoint)
+                        mcp_endpoints.record_success(url)
+                    content = response.model_dump()
+                    selected = checkpoint.selector_b_retry or checkpoint.selector_b or {}
+                    content["verdictId"] = verdict_store.put(content, dataset, selected.get("filters"))
+                    _VERDICT_CACHE.set(cache_key, content)
+                    return _verdict_response(content, detail)
+                except (DeadlineExceeded, asyncio.CancelledError):
+                    if used_endpoint:
+                        # No verdict on the endpoint either way; free a half-open trial for the next request.
+                        mcp_endpoints.release_trial(url)
+                    raise
+                except MCPClientError as exc:
+                    mcp_endpoints.record_failure(url)
+                    checkpoint.record_retry(url, attempt, exc)
                     if delay:
-                        await asyncio.sleep(delay)
+                        await asyncio.sleep(budget("retry_backoff", delay))
                     continue
-                except Exception:
-                    logger.exception("MCP pipeline failed for url=%s at step=%s", url, current_step)
+                except Exception as exc:
+                    logger.exception("MCP pipeline failed for url=%s at step=%s", url, checkpoint.stage)
+                    if used_endpoint:
+                        # Only MCP-stage failures count against the endpoint; LLM failures do not.
+                        if checkpoint.stage in MCP_STAGES or checkpoint.stage.startswith("step4_"):
+                            mcp_endpoints.record_failure(url)
+                        else:
+                            mcp_endpoints.record_success(url)
+                    checkpoint.record_retry(url, attempt, exc)
                     if delay:
-                        await asyncio.sleep(delay)
+                        await asyncio.sleep(budget("retry_backoff", delay))
                     continue
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content=ErrorResponse(error=True, message="MCP server not responding").model_dump(),
         )
+    except asyncio.CancelledError:
+        metrics.incr("pipeline_cancelled", stage=checkpoint.stage)
+        raise
+    except DeadlineExceeded:
+        return _degraded_response(dataset, indicator_hint, checkpoint, detail)
     except Exception:
         logger.exception("Unexpected error in check-claim")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content=ErrorResponse(error=True, message="Unexpected error").model_dump(),
         )
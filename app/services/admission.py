@@ -0,0 +1,118 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from app.config import settings
+from app.services import metrics
+from app.services.deadline import remaining
+from app.services.latency import LatencyTracker
+
+queue_latency = LatencyTracker(min_samples=1)
+
+
+class AdmissionRejected(RuntimeError):
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(f"Request shed: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimit:
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"{self.name}_active", self.active)
+        metrics.set_gauge(f"{self.name}_queue_depth", self.waiting)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        start = time.perf_counter()
+        self.waiting += 1
+        self._publish()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        queue_latency.record(self.name, time.perf_counter() - start)
+        self.active += 1
+        self._publish()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self._publish()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+
+class AdmissionController(ConcurrencyLimit):
+    def __init__(self, name: str, limit: int, max_queue: int, slo_seconds: float) -> None:
+        super().__init__(name, limit)
+        self.max_queue = max_queue
+        self.slo_seconds = slo_seconds
+        # Seeded with a typical uncached pipeline; updated from real runs.
+        self.service_seconds = 8.0
+
+    def estimated_wait(self) -> float:
+        if self.active < self.limit:
+            return 0.0
+        # Everyone ahead in the queue plus this request shares `limit` slots.
+        return (self.waiting + 1) / self.limit * self.service_seconds
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        wait = self.estimated_wait()
+        reason = None
+        if self.waiting >= self.max_queue:
+            reason = "queue_full"
+        elif wait > self.slo_seconds:
+            reason = "slo"
+        elif (left := remaining()) is not None and wait > left:
+            # The request would spend its whole budget in the queue.
+            reason = "deadline"
+        if reason is not None:
+            metrics.incr("admission_rejected", reason=reason)
+            raise AdmissionRejected(reason, retry_after=max(1, math.ceil(wait)))
+
+        async with self.slot():
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.service_seconds = 0.8 * self.service_seconds + 0.2 * (time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **super().snapshot(),
+            "max_queue": self.max_queue,
+            "estimated_wait": round(self.estimated_wait(), 2),
+            "service_seconds": round(self.service_seconds, 2),
+        }
+
+
+claim_admission = AdmissionController(
+    "claims",
+    settings.claims_max_concurrency,
+    settings.claims_max_queue,
+    settings.claims_queue_slo_seconds,
+)
+llm_slots = ConcurrencyLimit("llm", settings.llm_max_concurrency)
+mcp_slots = ConcurrencyLimit("mcp", settings.mcp_max_concurrency)
+
+
+def snapshot() -> dict[str, Any]:
+    return {
+        "claims": claim_admission.snapshot(),
+        "llm": llm_slots.snapshot(),
+        "mcp": mcp_slots.snapshot(),
+        "wait": queue_latency.snapshot(),
+    }
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.preview import RawPreview
+
+
+@dataclass
+class PipelineCheckpoint:
+    stage: str = "connect"
+    steps: list[dict[str, Any]] = field(default_factory=list)
+    step1_done: bool = False
+    step2_payload: Any = None
+    selector_a: dict[str, Any] | None = None
+    step3_payload: Any = None
+    selector_b: dict[str, Any] | None = None
+    # Step-4 results keyed by label ("primary", "benchmark", "primary_retry", ...).
+    step4: dict[str, tuple[list[dict[str, Any]], bool]] = field(default_factory=dict)
+    # Rows of every planned 4_get_data call already made, so later phases never repeat one.
+    step4_calls: dict[str, tuple[dict[str, Any], list[dict[str, Any]], bool]] = field(default_factory=dict)
+    selector_b_retry: dict[str, Any] | None = None
+    interpretation: dict[str, Any] | None = None
+    mcp_done: bool = False
+    retries: int = 0
+
+    def record_retry(self, url: str, attempt: int, error: Exception) -> None:
+        self.retries += 1
+        self.steps.append(
+            {
+                "id": 0,
+                "name": "Retry",
+                "description": f"Resuming from {self.stage} (attempt {attempt} via {url})",
+                "result": type(error).__name__,
+                "time": "0.00s",
+                "rawJson": RawPreview({"url": url, "attempt": attempt, "stage": self.stage, "error": str(error)}),
+            }
+        )
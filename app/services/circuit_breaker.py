@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger("app.circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class EndpointBreaker:
+    def __init__(self, url: str, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            # Let exactly one request through to test the endpoint.
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("MCP endpoint recovered url=%s", self.url)
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("MCP endpoint breaker opened url=%s failures=%d", self.url, self.failures)
+            self.opened_at = time.monotonic()
+
+
+class EndpointRouter:
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.last_good: str | None = None
+        self._breakers: dict[str, EndpointBreaker] = {}
+
+    def breaker(self, url: str) -> EndpointBreaker:
+        if url not in self._breakers:
+            self._breakers[url] = EndpointBreaker(url, self.failure_threshold, self.reset_timeout)
+        return self._breakers[url]
+
+    def ordered(self, urls: list[str]) -> list[str]:
+        # Sticky routing: the last URL that worked goes first; open endpoints are skipped.
+        ranked = sorted(urls, key=lambda url: url != self.last_good)
+        return [url for url in ranked if self.breaker(url).state != OPEN]
+
+    def allow(self, url: str) -> bool:
+        return self.breaker(url).allow_request()
+
+    def record_success(self, url: str) -> None:
+        self.breaker(url).record_success()
+        self.last_good = url
+
+    def release_trial(self, url: str) -> None:
+        self.breaker(url).release_trial()
+
+    def record_failure(self, url: str) -> None:
+        self.breaker(url).record_failure()
+        if self.last_good == url:
+            self.last_good = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "last_good": self.last_good,
+            "endpoints": {
+                url: {"state": breaker.state, "failures": breaker.failures}
+                for url, breaker in self._breakers.items()
+            },
+        }
+
+    async def probe_forever(self, urls: list[str], interval: float = 15.0) -> None:
+        from app.services.mcp_client import open_client
+
+        while True:
+            await asyncio.sleep(interval)
+            for url in urls:
+                if self.breaker(url).state == CLOSED:
+                    continue
+                try:
+                    async with open_client(url) as client:
+                        await asyncio.wait_for(client.ping(), timeout=5.0)
+                except Exception as exc:  # noqa: BLE001
+                    logger.info("MCP probe failed url=%s error=%s", url, exc)
+                    self.record_failure(url)
+                else:
+                    # Close the breaker but keep routing on the URL that served real traffic.
+                    self.breaker(url).record_success()
+
+
+mcp_endpoints = EndpointRouter()
@@ -2,10 +2,9 @@ import json
 from pathlib import Path
 from typing import Any
 
-import httpx
-from openai import AsyncOpenAI
-
 from app.config import settings
+from app.services import fastjson
+from app.services.llm import complete_json
 
 
 class ClassificationError(RuntimeError):
@@ -55,13 +54,6 @@ async def classify_claim(claim: str) -> dict[str, Any]:
     if not settings.openai_api_key:
         raise ClassificationError("OPENAI_API_KEY is not set")
 
-    if settings.openai_ssl_verify:
-        http_client = None
-    else:
-        http_client = httpx.AsyncClient(verify=False)
-
-    client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
-
     step1_overview = None
     step1_path = Path("step1_overview.json")
     if step1_path.exists():
@@ -70,32 +62,18 @@ async def classify_claim(claim: str) -> dict[str, Any]:
         except json.JSONDecodeError:
             step1_overview = None
 
-    response = await client.chat.completions.create(
-        model="gpt-4.1-mini",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": json.dumps(
-                    {"claim": claim, "step1_overview": step1_overview},
-                    ensure_ascii=True,
-                ),
-            },
-        ],
+    content = await complete_json(
+        "classifier",
+        _SYSTEM_PROMPT,
+        {"claim": claim, "step1_overview": step1_overview},
         temperature=0.1,
     )
-
-    content = response.choices[0].message.content
     if not content:
         raise ClassificationError("Empty response from classifier")
 
     try:
-        parsed = json.loads(content)
+        parsed = fastjson.loads(content)
     except json.JSONDecodeError as exc:
         raise ClassificationError("Classifier returned invalid JSON") from exc
 
-    if http_client is not None:
-        await http_client.aclose()
-
     return parsed
@@ -0,0 +1,64 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator
+
+from app.services import metrics
+
+# Absolute time.monotonic() by which the current claim must be answered; None outside a request.
+_DEADLINE: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"Request deadline exceeded during {stage}")
+        self.stage = stage
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    token = _DEADLINE.set(time.monotonic() + seconds if seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> float | None:
+    deadline = _DEADLINE.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def _exceeded(stage: str) -> DeadlineExceeded:
+    metrics.incr("deadline_exceeded", stage=stage)
+    return DeadlineExceeded(stage)
+
+
+def budget(stage: str, cap: float | None = None) -> float | None:
+    # A stage gets its own cap or whatever is left of the request, whichever is smaller.
+    left = remaining()
+    if left is None:
+        return cap
+    if left <= 0:
+        raise _exceeded(stage)
+    return left if cap is None else min(cap, left)
+
+
+@asynccontextmanager
+async def within_deadline(stage: str, cap: float | None = None) -> AsyncIterator[None]:
+    timeout = budget(stage, cap)
+    try:
+        async with asyncio.timeout(timeout):
+            yield
+    except DeadlineExceeded:
+        raise
+    except TimeoutError:
+        if expired():
+            raise _exceeded(stage) from None
+        raise
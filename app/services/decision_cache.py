@@ -0,0 +1,117 @@
+import copy
+import hashlib
+import re
+from typing import Any, Iterable
+
+from app.config import settings
+from app.services import fastjson, metrics
+from app.services.cache import TTLCache
+from app.services.filter_rules import DATASET_SUBGROUPS, DIMENSION_ENTITIES
+from app.services.time_scope import parse_time_scope
+from app.services.verdict_engine import INTENSITY_RE, MULTIPLE_RE, THRESHOLD_RE, claim_direction
+
+# The operator is kept ("higher than", "worse"): with entities in claim order it fixes which side is which.
+COMPARISON_RE = re.compile(
+    r"\b((?:[a-z]+\s+)?than|vs\.?|versus|compared|relative to|gap|worse|better)\b", re.IGNORECASE
+)
+# Fallback for names not in the Step-3 options; a capitalized word counts at the start of the claim too.
+PROPER_NOUN_RE = re.compile(r"(?<![\w'])([A-Z][a-z]{3,}(?:\s[A-Z][a-z]+)*)")
+STOPWORDS = {"a", "an", "the", "of", "in", "for", "and", "or", "to", "on", "by", "rate", "index", "india", "indian"}
+
+PROMPT_VERSIONS: dict[str, str] = {}
+
+
+def prompt_version(service: str, prompt: str) -> str:
+    version = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    PROMPT_VERSIONS[service] = version
+    return version
+
+
+def payload_digest(payload: Any) -> str:
+    return hashlib.sha256(fastjson.dumps_bytes(payload, sort_keys=True)).hexdigest()[:16]
+
+
+def normalize_hint(hint: str) -> str:
+    words = re.findall(r"[a-z0-9]+", hint.lower())
+    return " ".join(sorted({word for word in words if word not in STOPWORDS}))
+
+
+def claim_features(claim: str, dataset: str, names: Iterable[str] = ()) -> dict[str, Any]:
+    # Only what can change a selector's answer: shape of the claim, time scope and named subgroups.
+    scope = parse_time_scope(claim)
+    found: list[tuple[int, str]] = []
+    for dimension, patterns in DIMENSION_ENTITIES.items():
+        for index, (pattern, _) in enumerate(patterns):
+            matches = re.finditer(pattern, claim, re.IGNORECASE)
+            found += [(match.start(), f"{dimension}:{index}") for match in matches]
+    subgroups = DATASET_SUBGROUPS.get(dataset.upper())
+    if subgroups:
+        matches = re.finditer(rf"\b(?:{subgroups})\b", claim, re.IGNORECASE)
+        found += [(match.start(), match.group().lower()) for match in matches]
+    for name in names:
+        match = re.search(rf"\b{re.escape(name)}\b", claim, re.IGNORECASE)
+        if match:
+            found.append((match.start(), name.lower()))
+    matched = {start for start, _ in found}
+    found += [
+        (match.start(), match.group().lower())
+        for match in PROPER_NOUN_RE.finditer(claim)
+        if match.start() not in matched and match.group().lower() not in STOPWORDS
+    ]
+    # Claim order, not sorted: "rural higher than urban" and "urban higher than rural" are different claims.
+    entities = list(dict.fromkeys(entity for _, entity in sorted(found)))
+    comparison = COMPARISON_RE.search(claim)
+    multiple = MULTIPLE_RE.search(claim)
+    return {
+        "direction": claim_direction(claim),
+        "threshold": bool(THRESHOLD_RE.search(claim)),
+        "comparison": re.sub(r"\s+", " ", comparison.group(1).lower()) if comparison else None,
+        "intensity": bool(INTENSITY_RE.search(claim)),
+        "multiple": multiple.group(1).lower()[:5] if multiple else None,
+        "time": [scope.kind, scope.years, scope.months] if scope is not None else None,
+        "entities": entities,
+    }
+
+
+def decision_key(
+    service: str,
+    version: str,
+    claim: str,
+    indicator_hint: str,
+    dataset: str,
+    names: Iterable[str] = (),
+    **parts: Any,
+) -> str:
+    return fastjson.dumps(
+        {
+            "service": service,
+            "version": version,
+            "dataset": dataset,
+            "hint": normalize_hint(indicator_hint),
+            "claim": claim_features(claim, dataset, names),
+            **parts,
+        },
+        sort_keys=True,
+    )
+
+
+class DecisionCache:
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self._entries = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, service: str, key: str | None) -> dict[str, Any] | None:
+        if key is None:
+            return None
+        cached = self._entries.get(key)
+        metrics.incr("decision_cache", service=service, result="hit" if cached is not None else "miss")
+        return copy.deepcopy(cached) if cached is not None else None
+
+    def set(self, key: str | None, decision: dict[str, Any]) -> None:
+        if key is not None:
+            self._entries.set(key, copy.deepcopy(decision))
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._entries.stats(), "prompt_versions": dict(PROMPT_VERSIONS)}
+
+
+decisions = DecisionCache(max_entries=settings.decision_cache_max_entries, ttl=settings.decision_cache_ttl_seconds)
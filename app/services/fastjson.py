@@ -0,0 +1,54 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> str:
+    return str(value)
+
+
+def dumps_bytes(value: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=_default, option=option)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases: fall through to the stdlib.
+            pass
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        default=_default,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+def dumps(value: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    return dumps_bytes(value, sort_keys=sort_keys, indent=indent).decode("utf-8")
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
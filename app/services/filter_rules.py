@@ -0,0 +1,244 @@
+import re
+from typing import Any
+
+from app.services import metrics
+from app.services.mirror import MONTH_KEYS, _is_year_key
+from app.services.time_scope import TimeScope
+
+LATEST_YEARS = 3
+MIN_NAME_LENGTH = 4
+RULE_CLAIM_TYPES = {"trend", "level", "comparison", "intra_comparison"}
+BENCHMARK_CLAIM_TYPES = {"comparison", "intra_comparison"}
+
+# Broadest value of each demographic/geographic dimension, matched against option names.
+DIMENSION_DEFAULTS = {
+    "state": r"^(all[\s_-]*india|india)$",
+    "sector": r"^(combined|total|all|rural\s*[+&]\s*urban|rural\s+and\s+urban)$",
+    "gender": r"^(total|persons?|all)$",
+    "sex": r"^(total|persons?|all)$",
+    "age": r"^(15\s*(years\s*)?(and|&)\s*(above|more)|15\+|all|total)",
+    "age_group": r"^(15\s*(years\s*)?(and|&)\s*(above|more)|15\+|all|total)",
+    "religion": r"^(all|total)$",
+    "social_category": r"^(all|total)$",
+    "social_group": r"^(all|total)$",
+    "education": r"^(all|total)$",
+    "weekly_status": r"(ps\s*\+\s*ss|usual)",
+}
+# Claim wording that selects a specific value of a dimension: (claim pattern, option-name pattern).
+DIMENSION_ENTITIES = {
+    "gender": [(r"\b(women|woman|female|girls?)\b", r"^(female|women)$"), (r"\b(men|man|male|boys?)\b", r"^(male|men)$")],
+    "sector": [(r"\b(rural|villages?)\b", r"^rural$"), (r"\b(urban|cit(y|ies)|towns?)\b", r"^urban$")],
+    "age": [(r"\b(youth|young)\b", r"15\s*-\s*29")],
+}
+# Highest aggregation first; the first option matching one of these wins.
+AGGREGATION_KEYS = {"level", "aggregation", "granularity", "frequency"}
+AGGREGATION_PREFERENCE = [r"^(all|total|general|overall)", r"national", r"^group$", r"division", r"section", r"annual"]
+GENERIC_TOTAL = r"^(all|total|general|overall|general index)\b"
+
+_COMMON_SUBGROUPS = r"manufactur\w*|mining|electricity|agricultur\w*|construction|services"
+DATASET_SUBGROUPS = {
+    "CPI": r"food|fuel|petrol|diesel|vegetables?|cereals?|pulses|milk|housing|health|clothing|transport|onions?|tomato\w*|rice|wheat|gold|education",
+    "WPI": r"food|fuel|power|primary articles|steel|metals?|chemicals?|onions?|vegetables?|" + _COMMON_SUBGROUPS,
+    "IIP": r"capital goods|consumer (durables|non-durables)|infrastructure|primary goods|intermediate|" + _COMMON_SUBGROUPS,
+    "PLFS": r"graduates?|educated|illiterate|caste|dalits?|scheduled|muslims?|hindus?|christians?|sikhs?|self[- ]employed|casual|salaried|regular wage|informal|" + _COMMON_SUBGROUPS,
+    "NAS": r"per capita|consumption|investment|exports?|imports?|trade|finance|public administration|" + _COMMON_SUBGROUPS,
+    "ASI": r"factories|wages|workers|profits?|capital|" + _COMMON_SUBGROUPS,
+    "ENERGY": r"coal|oil|crude|natural gas|renewables?|solar|wind|petroleum|nuclear|hydro|" + _COMMON_SUBGROUPS,
+}
+
+_STATS = {"rules": 0, "llm": 0}
+
+
+class RuleFallback(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _base(key: str) -> str:
+    return key.lower().removesuffix("_code").removesuffix("_name")
+
+
+def _options(step3_payload: dict[str, Any]) -> dict[str, list[tuple[str, str]]]:
+    data = step3_payload.get("data") if isinstance(step3_payload, dict) else None
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        data = data[0]
+    options: dict[str, list[tuple[str, str]]] = {}
+    if not isinstance(data, dict):
+        return options
+    for key, values in data.items():
+        if not isinstance(values, list):
+            continue
+        for entry in values:
+            if isinstance(entry, dict):
+                code_key = next((k for k in entry if k.endswith("_code")), key if key in entry else None)
+                name_key = next((k for k in entry if k.endswith("_name")), code_key)
+                if code_key is None:
+                    continue
+                options.setdefault(_base(code_key), []).append((str(entry[code_key]), str(entry.get(name_key))))
+            elif isinstance(entry, (str, int)):
+                options.setdefault(_base(key), []).append((str(entry), str(entry)))
+    return options
+
+
+def option_names(step3_payload: Any) -> list[str]:
+    # Named values (states, sectors, subgroups) a claim can pick out, for matching claim text against.
+    return sorted(
+        {name for values in _options(step3_payload).values() for _, name in values if len(name) >= MIN_NAME_LENGTH}
+    )
+
+
+def _find(options: list[tuple[str, str]], pattern: str) -> str | None:
+    regex = re.compile(pattern, re.IGNORECASE)
+    return next((code for code, name in options if regex.search(name.strip()) or regex.search(code)), None)
+
+
+def _mentions(claim: str, base: str, options: list[tuple[str, str]]) -> list[tuple[int, str]]:
+    found: list[tuple[int, str]] = []
+    for claim_pattern, option_pattern in DIMENSION_ENTITIES.get(base, []):
+        match = re.search(claim_pattern, claim, re.IGNORECASE)
+        code = _find(options, option_pattern) if match else None
+        if match and code is not None:
+            found.append((match.start(), code))
+    default = DIMENSION_DEFAULTS.get(base)
+    for code, name in options:
+        if len(name) < MIN_NAME_LENGTH or (default and re.search(default, name.strip(), re.IGNORECASE)):
+            continue
+        match = re.search(rf"\b{re.escape(name)}\b", claim, re.IGNORECASE)
+        if match and all(code != seen for _, seen in found):
+            found.append((match.start(), code))
+    return sorted(found)
+
+
+def _latest_years(options: list[tuple[str, str]]) -> str:
+    years = sorted({code for code, _ in options if code[:4].isdigit()}, key=lambda code: code[:4])
+    if not years:
+        raise RuleFallback("no_years")
+    return ",".join(years[-LATEST_YEARS:])
+
+
+def build_filters(
+    claim: str,
+    dataset: str,
+    claim_type: str,
+    step3_payload: dict[str, Any],
+    indicator_params: dict[str, Any],
+    time_scope: TimeScope | None = None,
+) -> dict[str, Any]:
+    if claim_type not in RULE_CLAIM_TYPES:
+        raise RuleFallback(f"claim_type:{claim_type}")
+    subgroups = DATASET_SUBGROUPS.get(dataset.upper())
+    if subgroups is None:
+        raise RuleFallback("dataset")
+    api_params = step3_payload.get("api_params", []) if isinstance(step3_payload, dict) else []
+    if not api_params:
+        raise RuleFallback("no_api_params")
+    options = _options(step3_payload)
+
+    filters: dict[str, str] = {}
+    optional: list[str] = []
+    contrast: tuple[str, str, str] | None = None
+    explained = claim
+    for param in api_params:
+        name = param.get("name")
+        if not name:
+            continue
+        base = _base(name)
+        required = bool(param.get("required"))
+        choices = options.get(base, [])
+        if name in indicator_params:
+            filters[name] = str(indicator_params[name])
+        elif _is_year_key(name):
+            filters[name] = _latest_years(choices)
+        elif name.lower() in MONTH_KEYS:
+            if time_scope is not None and time_scope.months:
+                filters[name] = ",".join(str(month) for month in time_scope.months)
+            elif required:
+                raise RuleFallback("month")
+        elif base in DIMENSION_DEFAULTS:
+            mentioned = _mentions(claim, base, choices)
+            default = _find(choices, DIMENSION_DEFAULTS[base])
+            if len(mentioned) > 2 or (len(mentioned) == 2 and contrast is not None):
+                raise RuleFallback("ambiguous_subgroup")
+            if len(mentioned) == 2:
+                contrast = (name, mentioned[0][1], mentioned[1][1])
+                filters[name] = mentioned[0][1]
+            elif mentioned:
+                filters[name] = mentioned[0][1]
+                if default is not None and contrast is None:
+                    contrast = (name, mentioned[0][1], default)
+            elif default is not None:
+                filters[name] = default
+                if not required:
+                    # Dropping a filter that is already at its broadest value never changes the claim.
+                    optional.append(name)
+            elif required:
+                raise RuleFallback(f"required:{name}")
+            for _, code in mentioned:
+                label = next((option for value, option in choices if value == code), code)
+                explained = re.sub(rf"\b{re.escape(label)}\b", " ", explained, flags=re.IGNORECASE)
+        elif base in AGGREGATION_KEYS:
+            code = next((found for pattern in AGGREGATION_PREFERENCE if (found := _find(choices, pattern))), None)
+            if code is not None:
+                filters[name] = code
+            elif required:
+                raise RuleFallback(f"required:{name}")
+        elif required:
+            # A required subcategory: only its overall value is safe without reading the claim.
+            code = _find(choices, GENERIC_TOTAL) or (choices[0][0] if len(choices) == 1 else None)
+            if code is None:
+                raise RuleFallback(f"required:{name}")
+            filters[name] = code
+
+    if re.search(rf"\b({subgroups})\b", explained, re.IGNORECASE):
+        raise RuleFallback("subgroup")
+    benchmark = None
+    if claim_type in BENCHMARK_CLAIM_TYPES or (claim_type == "level" and contrast is not None):
+        if contrast is None:
+            raise RuleFallback("no_benchmark")
+        key, _, other = contrast
+        benchmark = {**filters, key: other}
+    return {
+        "dataset": dataset,
+        "filters": filters,
+        "benchmark_filters": benchmark,
+        "optional_drop_filters": optional[-3:],
+        "reasoning": "Default filters from dataset rules",
+        "source": "rules",
+    }
+
+
+def rule_filters(
+    claim: str,
+    dataset: str,
+    claim_type: str,
+    step3_payload: dict[str, Any],
+    indicator_params: dict[str, Any],
+    time_scope: TimeScope | None = None,
+) -> dict[str, Any] | None:
+    try:
+        selected = build_filters(claim, dataset, claim_type, step3_payload, indicator_params, time_scope)
+    except RuleFallback as exc:
+        record_selector_b("llm", dataset, exc.reason)
+        return None
+    record_selector_b("rules", dataset)
+    return selected
+
+
+def record_selector_b(source: str, dataset: str, reason: str | None = None) -> None:
+    _STATS[source] += 1
+    metrics.incr("selector_b", source=source, dataset=dataset)
+    if reason is not None:
+        metrics.incr("selector_b_fallback", reason=reason.split(":")[0])
+
+
+def record_rule_miss(dataset: str) -> None:
+    # Rule filters that fetched nothing were handed to the LLM after all; count them as such.
+    _STATS["rules"] -= 1
+    metrics.incr("selector_b", -1, source="rules", dataset=dataset)
+    record_selector_b("llm", dataset, "empty_rows")
+
+
+def bypass_stats() -> dict[str, Any]:
+    total = _STATS["rules"] + _STATS["llm"]
+    return {**_STATS, "bypass_rate": round(_STATS["rules"] / total, 3) if total else None}
@@ -1,10 +1,12 @@
 import json
 from typing import Any
 
-import httpx
-from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from app.config import settings
+from app.models.schemas import ExplanationOutput, InterpretationOutput
+from app.services import fastjson
+from app.services.llm import complete_json, validate_or_repair
 
 
 class InterpretationError(RuntimeError):
@@ -49,6 +51,66 @@ Output JSON ONLY in this schema:
 """.strip()
 
 
+_EXPLAIN_PROMPT = """
+You are the explainer for the “Dinner Table Economist” app.
+Users make claims about the Indian economy. The verdict has already been computed from MoSPI data
+by deterministic rules; you only write the explanation for it.
+
+Guardrails (MUST FOLLOW):
+- Do NOT change or question the verdict or the headlineStat.
+- Do NOT make causal claims, extrapolate beyond the data, or make policy recommendations.
+- Use ONLY the numbers in chartData. Do not invent values.
+- Always cite the dataset and year(s) used.
+
+Output JSON ONLY in this schema:
+{
+  "explanation": "2-4 sentences",
+  "source": "dataset + year attribution"
+}
+""".strip()
+
+
+def _as_number(value: Any) -> float | None:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", "").replace("%", "").strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _fix_interpretation(parsed: dict[str, Any], source_hint: str) -> dict[str, Any]:
+    fixed = dict(parsed)
+    if isinstance(fixed.get("verdict"), str):
+        fixed["verdict"] = fixed["verdict"].strip().lower()
+
+    points = fixed.get("chartData")
+    if isinstance(points, list):
+        cleaned = []
+        for point in points:
+            if not isinstance(point, dict):
+                continue
+            value = _as_number(point.get("value"))
+            if value is None or point.get("year") is None:
+                continue
+            cleaned.append({**point, "year": str(point["year"]), "value": value})
+        # Dropping every point would hide the problem; leave it for the repair prompt instead.
+        if cleaned:
+            fixed["chartData"] = cleaned
+            if not fixed.get("headlineStat"):
+                first, last = cleaned[0], cleaned[-1]
+                label = first.get("label") or "Value"
+                fixed["headlineStat"] = (
+                    f"{label}: {first['value']:g} in {first['year']} vs {last['value']:g} in {last['year']}"
+                )
+
+    if not fixed.get("source"):
+        fixed["source"] = source_hint
+    return fixed
+
+
 async def interpret_claim(
     claim: str,
     dataset: str,
@@ -56,17 +118,11 @@ async def interpret_claim(
     filters: dict[str, Any],
     data_rows: Any,
     source_hint: str,
+    claim_type: str | None = None,
 ) -> dict[str, Any]:
     if not settings.openai_api_key:
         raise InterpretationError("OPENAI_API_KEY is not set")
 
-    if settings.openai_ssl_verify:
-        http_client = None
-    else:
-        http_client = httpx.AsyncClient(verify=False)
-
-    client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
-
     payload = {
         "claim": claim,
         "dataset": dataset,
@@ -76,26 +132,69 @@ async def interpret_claim(
         "source_hint": source_hint,
     }
 
-    response = await client.chat.completions.create(
-        model="gpt-4.1",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {"role": "user", "content": json.dumps(payload, ensure_ascii=True)},
-        ],
-        temperature=0.2,
-    )
-
-    content = response.choices[0].message.content
+    content = await complete_json("interpreter", _SYSTEM_PROMPT, payload, temperature=0.2, claim_type=claim_type)
     if not content:
         raise InterpretationError("Empty response from interpreter")
 
     try:
-        parsed = json.loads(content)
+        parsed = fastjson.loads(content)
     except json.JSONDecodeError as exc:
         raise InterpretationError("Interpreter returned invalid JSON") from exc
-    finally:
-        if http_client is not None:
-            await http_client.aclose()
 
-    return parsed
+    try:
+        validated = await validate_or_repair(
+            "interpreter",
+            InterpretationOutput,
+            parsed,
+            lambda raw: _fix_interpretation(raw, source_hint),
+        )
+    except ValidationError as exc:
+        raise InterpretationError("Interpreter returned output that does not match its schema") from exc
+
+    return validated.model_dump()
+
+
+async def explain_verdict(
+    claim: str,
+    dataset: str,
+    indicator: str,
+    verdict: str,
+    headline_stat: str,
+    chart_data: list[dict[str, Any]],
+    basis: str,
+    source_hint: str,
+) -> dict[str, Any]:
+    if not settings.openai_api_key:
+        raise InterpretationError("OPENAI_API_KEY is not set")
+
+    payload = {
+        "claim": claim,
+        "dataset": dataset,
+        "indicator": indicator,
+        "verdict": verdict,
+        "headlineStat": headline_stat,
+        "chartData": chart_data,
+        "rule_basis": basis,
+        "source_hint": source_hint,
+    }
+
+    content = await complete_json("explainer", _EXPLAIN_PROMPT, payload, temperature=0.2)
+    if not content:
+        raise InterpretationError("Empty response from explainer")
+
+    try:
+        parsed = fastjson.loads(content)
+    except json.JSONDecodeError as exc:
+        raise InterpretationError("Explainer returned invalid JSON") from exc
+
+    try:
+        validated = await validate_or_repair(
+            "explainer",
+            ExplanationOutput,
+            parsed,
+            lambda raw: {**raw, "source": raw.get("source") or source_hint},
+        )
+    except ValidationError as exc:
+        raise InterpretationError("Explainer returned output that does not match its schema") from exc
+
+    return validated.model_dump()
@@ -0,0 +1,52 @@
+import math
+from collections import deque
+from typing import Any
+
+
+class LatencyTracker:
+    def __init__(
+        self,
+        window: int = 100,
+        min_samples: int = 5,
+        timeout_multiplier: float = 4.0,
+        timeout_floor: float = 5.0,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.timeout_floor = timeout_floor
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, pct: float) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def timeout_for(self, key: str, default: float) -> float:
+        p99 = self.percentile(key, 99)
+        if p99 is None:
+            return default
+        return min(default, max(self.timeout_floor, p99 * self.timeout_multiplier))
+
+    def hedge_delay(self, key: str) -> float | None:
+        return self.percentile(key, 95)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            key: {
+                "count": len(samples),
+                "p50": self.percentile(key, 50),
+                "p95": self.percentile(key, 95),
+                "p99": self.percentile(key, 99),
+            }
+            for key, samples in self._samples.items()
+        }
+
+
+tool_latency = LatencyTracker()
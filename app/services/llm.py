@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.config import settings
+from app.services import fastjson, metrics, offload
+from app.services.admission import llm_slots
+from app.services.deadline import within_deadline
+from app.services.latency import LatencyTracker
+from app.services.offload import payload_size
+
+logger = logging.getLogger("app.llm")
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Services that default to the large tier; everything else starts on the small one.
+LARGE_BY_DEFAULT = {"interpreter"}
+SIMPLE_CLAIM_TYPES = {"trend", "level"}
+
+_REPAIR_PROMPT = """
+You repair JSON produced by another model so that it matches a JSON schema.
+You are given the schema, the invalid JSON, the validation errors and the list of fields to fix.
+Return ONLY a JSON object containing corrected values for the listed fields.
+Do not change any other field. Do not invent numbers that are not present in the invalid JSON.
+""".strip()
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for the JSON prompts we send.
+    return len(text) // 4
+
+
+class ModelRouter:
+    def __init__(self, window: int = 50) -> None:
+        self.latency = LatencyTracker(window=window)
+        self._outcomes: dict[str, deque[bool]] = {}
+
+    def record(self, model: str, seconds: float, ok: bool) -> None:
+        self.latency.record(model, seconds)
+        self._outcomes.setdefault(model, deque(maxlen=self.latency.window)).append(ok)
+
+    def error_rate(self, model: str) -> float:
+        outcomes = self._outcomes.get(model)
+        if not outcomes or len(outcomes) < self.latency.min_samples:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def healthy(self, model: str) -> bool:
+        p95 = self.latency.percentile(model, 95)
+        slow = p95 is not None and p95 > settings.llm_latency_budget_seconds
+        return not slow and self.error_rate(model) <= settings.llm_max_error_rate
+
+    def choose(self, service: str, tokens: int, claim_type: str | None = None) -> tuple[str, str]:
+        small, large = settings.llm_small_model, settings.llm_large_model
+        if service in LARGE_BY_DEFAULT:
+            if tokens <= settings.llm_small_max_tokens and claim_type in SIMPLE_CLAIM_TYPES:
+                model, reason = small, "small_payload"
+            else:
+                model, reason = large, "default"
+        elif tokens >= settings.llm_large_min_tokens:
+            model, reason = large, "large_payload"
+        else:
+            model, reason = small, "default"
+
+        other = large if model == small else small
+        if not self.healthy(model) and self.healthy(other):
+            model, reason = other, "unhealthy_fallback"
+        return model, reason
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            model: {**stats, "error_rate": self.error_rate(model)}
+            for model, stats in self.latency.snapshot().items()
+        }
+
+
+model_router = ModelRouter()
+
+
+async def complete_json(
+    service: str,
+    system_prompt: str,
+    payload: dict[str, Any],
+    temperature: float,
+    claim_type: str | None = None,
+) -> str | None:
+    # The OpenAI SDK is heavy to import; defer it until the first LLM call.
+    import httpx
+    from openai import AsyncOpenAI
+
+    # Step-3 metadata in a Selector-B prompt can run to thousands of options.
+    user_content = await offload.run_sync("prompt_dump", payload_size(payload), fastjson.dumps, payload)
+    tokens = estimate_tokens(system_prompt) + estimate_tokens(user_content)
+    model, reason = model_router.choose(service, tokens, claim_type)
+    metrics.incr("llm_route", service=service, model=model, reason=reason)
+    logger.info("LLM route service=%s model=%s reason=%s tokens~%d", service, model, reason, tokens)
+
+    # The request budget covers the wait for a slot as well as the call.
+    async with within_deadline(service), llm_slots.slot():
+        if settings.openai_ssl_verify:
+            http_client = None
+        else:
+            http_client = httpx.AsyncClient(verify=False)
+
+        client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
+
+        start = time.perf_counter()
+        ok = False
+        cancelled = False
+        try:
+            # Closing the client on exit returns its connections even when the call is cancelled.
+            async with client:
+                response = await client.chat.completions.create(
+                    model=model,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_content},
+                    ],
+                    temperature=temperature,
+                )
+            ok = True
+        except asyncio.CancelledError:
+            cancelled = True
+            metrics.incr("llm_cancelled", service=service, model=model)
+            raise
+        finally:
+            # A cancelled call says nothing about the model's health, so it stays out of routing stats.
+            if not cancelled:
+                model_router.record(model, time.perf_counter() - start, ok)
+                if not ok:
+                    metrics.incr("llm_errors", service=service, model=model)
+
+    return response.choices[0].message.content
+
+
+async def validate_or_repair(
+    service: str,
+    schema: type[SchemaT],
+    parsed: Any,
+    fixup: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> SchemaT:
+    if not isinstance(parsed, dict):
+        parsed = {}
+    if fixup is not None:
+        parsed = fixup(parsed)
+    try:
+        return schema.model_validate(parsed)
+    except ValidationError as exc:
+        errors = exc.errors()
+
+    # Ask for the failing top-level fields only; the rest of the output is kept as-is.
+    fields = sorted({str(error["loc"][0]) for error in errors if error.get("loc")})
+    metrics.incr("llm_validation_errors", service=service)
+    logger.warning("LLM output invalid service=%s fields=%s", service, fields)
+    content = await complete_json(
+        f"{service}_repair",
+        _REPAIR_PROMPT,
+        {
+            "schema": schema.model_json_schema(),
+            "invalid_json": parsed,
+            "errors": [{"loc": list(error["loc"]), "msg": error["msg"]} for error in errors],
+            "fields_to_fix": fields,
+        },
+        temperature=0.0,
+    )
+    try:
+        repaired = fastjson.loads(content) if content else {}
+    except json.JSONDecodeError:
+        repaired = {}
+    merged = {**parsed, **{key: repaired[key] for key in fields if isinstance(repaired, dict) and key in repaired}}
+    if fixup is not None:
+        merged = fixup(merged)
+    validated = schema.model_validate(merged)
+    metrics.incr("llm_repairs", service=service)
+    return validated
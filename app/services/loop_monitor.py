@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from types import FrameType
+from typing import Any
+
+from app.config import settings
+from app.services import metrics
+from app.services.latency import LatencyTracker
+
+logger = logging.getLogger("app.loop_monitor")
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _culprit(frame: FrameType | None) -> str:
+    # Innermost frame in our own code names the stage; library frames below it are just the mechanics.
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(_APP_ROOT) and not path.endswith("loop_monitor.py"):
+            module = os.path.splitext(os.path.relpath(path, _APP_ROOT))[0].replace(os.sep, ".")
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = LatencyTracker(window=500, min_samples=1)
+        self.recent: deque[dict[str, Any]] = deque(maxlen=20)
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._suspect: str | None = None
+        self._stop = threading.Event()
+
+    def _watch(self) -> None:
+        # Runs off the loop: while the loop is stuck, sample what its thread is executing.
+        while not self._stop.wait(self.interval):
+            stalled = time.monotonic() - self._beat > self.interval + self.threshold
+            if stalled and self._suspect is None and self._loop_thread is not None:
+                self._suspect = _culprit(sys._current_frames().get(self._loop_thread))
+
+    async def run(self) -> None:
+        self._loop_thread = threading.get_ident()
+        watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                self._beat = time.monotonic()
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, time.monotonic() - self._beat - self.interval)
+                self.lag.record("loop", lag)
+                if lag > self.threshold:
+                    self._record_stall(lag, self._suspect or "unknown")
+                self._suspect = None
+        finally:
+            self._stop.set()
+
+    def _record_stall(self, lag: float, stage: str) -> None:
+        metrics.incr("loop_stalls", stage=stage)
+        self.recent.append({"seconds": round(lag, 3), "stage": stage, "at": time.time()})
+        logger.warning("Event loop stalled for %.0fms in %s", lag * 1000, stage)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "lag": self.lag.snapshot().get("loop"),
+            "threshold": self.threshold,
+            "recent_stalls": list(self.recent),
+        }
+
+
+loop_monitor = LoopLagMonitor(threshold=settings.loop_stall_threshold_ms / 1000)
@@ -1,10 +1,13 @@
-import json
 import time
-from typing import Any
-
-from fastmcp import Client
+from typing import TYPE_CHECKING, Any
 
 from app.config import settings
+from app.services.circuit_breaker import mcp_endpoints
+from app.services.preview import RawPreview
+
+
+if TYPE_CHECKING:
+    from fastmcp import Client
 
 
 class MCPClientError(RuntimeError):
@@ -14,14 +17,11 @@ class MCPClientError(RuntimeError):
 _STEP1_CACHE: dict[str, Any] | None = None
 
 
-def _truncate_raw(value: Any, limit: int = 500) -> str:
-    if isinstance(value, str):
-        raw = value
-    else:
-        raw = json.dumps(value, ensure_ascii=True, default=str)
-    if len(raw) <= limit:
-        return raw
-    return raw[: limit - 3] + "..."
+def open_client(url: str) -> "Client":
+    # fastmcp pulls in the whole MCP SDK; import it on first use to keep boot fast.
+    from fastmcp import Client
+
+    return Client(url)
 
 
 def _stringify_filters(filters: dict[str, Any]) -> dict[str, str]:
@@ -35,17 +35,21 @@ def _format_step(step_id: int, name: str, description: str, result: str, duratio
         "description": description,
         "result": result,
         "time": f"{duration:.2f}s",
-        "rawJson": _truncate_raw(raw),
+        "rawJson": RawPreview(raw),
     }
 
 
-def _candidate_urls() -> list[str]:
+def _configured_urls() -> list[str]:
     base = settings.mospi_mcp_url.rstrip("/")
     if base.endswith("/mcp"):
         return [base]
     return [base, f"{base}/mcp"]
 
 
+def _candidate_urls() -> list[str]:
+    return mcp_endpoints.ordered(_configured_urls())
+
+
 async def run_mcp_chain(
     dataset: str,
     indicator_hint: str,
@@ -58,8 +62,10 @@ async def run_mcp_chain(
     last_error: Exception | None = None
 
     for url in _candidate_urls():
+        if not mcp_endpoints.allow(url):
+            continue
         try:
-            async with Client(url) as client:
+            async with open_client(url) as client:
                 if _STEP1_CACHE is None:
                     start = time.perf_counter()
                     step1 = await client.call_tool("1_know_about_mospi_api", {})
@@ -138,6 +144,7 @@ async def run_mcp_chain(
                     )
                 )
 
+                mcp_endpoints.record_success(url)
                 return {
                     "overview": _STEP1_CACHE,
                     "indicators": step2,
@@ -147,6 +154,7 @@ async def run_mcp_chain(
                 }
         except Exception as exc:  # noqa: BLE001
             last_error = exc
+            mcp_endpoints.record_failure(url)
             trace.append(
                 _format_step(
                     0,
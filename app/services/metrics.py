@@ -0,0 +1,29 @@
+import threading
+from collections import defaultdict
+from typing import Any
+
+_LOCK = threading.Lock()
+_COUNTERS: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+_GAUGES: dict[str, float] = {}
+
+
+def _label_key(labels: dict[str, Any]) -> str:
+    return ",".join(f"{key}={labels[key]}" for key in sorted(labels)) or "total"
+
+
+def incr(name: str, amount: int = 1, **labels: Any) -> None:
+    with _LOCK:
+        _COUNTERS[name][_label_key(labels)] += amount
+
+
+def set_gauge(name: str, value: float) -> None:
+    with _LOCK:
+        _GAUGES[name] = value
+
+
+def snapshot() -> dict[str, Any]:
+    with _LOCK:
+        return {
+            "counters": {name: dict(values) for name, values in _COUNTERS.items()},
+            "gauges": dict(_GAUGES),
+        }
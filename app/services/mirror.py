@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.services import fastjson
+from app.services.normalizer import MONTH_NAME_TO_NUM
+
+logger = logging.getLogger("app.mirror")
+
+PAGING_KEYS = {"page", "limit"}
+MONTH_KEYS = {"month_code", "month"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slices (
+    slice_key TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    filters_json TEXT NOT NULL,
+    year_key TEXT NOT NULL DEFAULT 'year',
+    years TEXT NOT NULL DEFAULT '',
+    month_key TEXT NOT NULL DEFAULT 'month_code',
+    months TEXT NOT NULL DEFAULT '',
+    synced_at REAL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rows (
+    slice_key TEXT NOT NULL,
+    year TEXT NOT NULL,
+    month TEXT NOT NULL,
+    row_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_lookup ON rows (slice_key, year, month);
+"""
+
+
+def _is_year_key(key: str) -> bool:
+    key_lower = key.lower()
+    return "year" in key_lower and key_lower != "base_year"
+
+
+def _split(value: Any) -> list[str]:
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+def _month(value: Any) -> str:
+    if isinstance(value, str) and value.strip().lower() in MONTH_NAME_TO_NUM:
+        return MONTH_NAME_TO_NUM[value.strip().lower()]
+    try:
+        return f"{int(float(value)):02d}"
+    except (TypeError, ValueError):
+        return ""
+
+
+def split_filters(filters: dict[str, Any]) -> tuple[dict[str, str], dict[str, str], list[str], list[str]]:
+    base: dict[str, str] = {}
+    time_keys = {"year": "year", "month": "month_code"}
+    years: list[str] = []
+    months: list[str] = []
+    for key, value in filters.items():
+        if key in PAGING_KEYS:
+            continue
+        if _is_year_key(key):
+            time_keys["year"] = key
+            years = _split(value)
+        elif key.lower() in MONTH_KEYS:
+            time_keys["month"] = key
+            months = [_month(part) for part in _split(value)]
+        else:
+            base[key] = str(value)
+    return base, time_keys, years, months
+
+
+def slice_key(dataset: str, base: dict[str, str]) -> str:
+    return f"{dataset}:{json.dumps(base, sort_keys=True, ensure_ascii=True)}"
+
+
+def _row_time(row: dict[str, Any]) -> tuple[str, str]:
+    year = ""
+    month = ""
+    for key, value in row.items():
+        if not year and _is_year_key(key):
+            year = str(value)
+        elif not month and key.lower() in MONTH_KEYS:
+            month = _month(value)
+    return year, month
+
+
+class MirrorStore:
+    def __init__(self, path: str, max_age: float) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._conn: sqlite3.Connection | None = None
+        # Lookups and notes run on worker threads; the shared connection is used by one at a time.
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def note_slice(self, dataset: str, filters: dict[str, Any]) -> None:
+        # Remember which slices live traffic asks for so the sync job knows what to mirror.
+        with self._lock:
+            base, time_keys, years, months = split_filters(filters)
+            key = slice_key(dataset, base)
+            db = self._db()
+            existing = db.execute("SELECT years, months FROM slices WHERE slice_key = ?", (key,)).fetchone()
+            if existing is None:
+                db.execute(
+                    "INSERT INTO slices (slice_key, dataset, filters_json, year_key, years, month_key, months, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 1)",
+                    (
+                        key,
+                        dataset,
+                        json.dumps(base, sort_keys=True),
+                        time_keys["year"],
+                        ",".join(years),
+                        time_keys["month"],
+                        ",".join(months),
+                    ),
+                )
+            else:
+                known_years = set(_split(existing[0])) | set(years)
+                known_months = set(_split(existing[1])) | set(months)
+                db.execute(
+                    "UPDATE slices SET hits = hits + 1, years = ?, months = ? WHERE slice_key = ?",
+                    (",".join(sorted(known_years)), ",".join(sorted(known_months)), key),
+                )
+            db.commit()
+
+    def query(self, dataset: str, filters: dict[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            base, _, years, months = split_filters(filters)
+            key = slice_key(dataset, base)
+            db = self._db()
+            meta = db.execute("SELECT synced_at FROM slices WHERE slice_key = ?", (key,)).fetchone()
+            if meta is None or meta[0] is None or time.time() - meta[0] > self.max_age:
+                return None
+
+            sql = "SELECT year, month, row_json FROM rows WHERE slice_key = ?"
+            params: list[Any] = [key]
+            if years:
+                sql += f" AND year IN ({','.join('?' * len(years))})"
+                params.extend(years)
+            if months:
+                sql += f" AND month IN ({','.join('?' * len(months))})"
+                params.extend(months)
+            found = db.execute(sql, params).fetchall()
+            # Only answer when every requested period is present; otherwise the network has newer data.
+            if years and {year for year, _, _ in found} != set(years):
+                return None
+            if months and {month for _, month, _ in found} != set(months):
+                return None
+            db.execute("UPDATE slices SET hits = hits + 1 WHERE slice_key = ?", (key,))
+            db.commit()
+            return {
+                "data": [fastjson.loads(row_json) for _, _, row_json in found],
+                "msg": "Data served from local mirror",
+                "meta_data": {"totalPages": 1, "source": "mirror", "synced_at": meta[0]},
+            }
+
+    def replace_rows(self, key: str, rows: list[dict[str, Any]]) -> None:
+        with self._lock, self._db() as db:
+            db.execute("DELETE FROM rows WHERE slice_key = ?", (key,))
+            db.executemany(
+                "INSERT INTO rows (slice_key, year, month, row_json) VALUES (?, ?, ?, ?)",
+                [(key, *_row_time(row), fastjson.dumps(row)) for row in rows],
+            )
+            db.execute("UPDATE slices SET synced_at = ? WHERE slice_key = ?", (time.time(), key))
+
+    def slices_to_sync(self, top: int) -> list[tuple[str, str, dict[str, str]]]:
+        cursor = self._db().execute(
+            "SELECT slice_key, dataset, filters_json, year_key, years, month_key, months "
+            "FROM slices ORDER BY hits DESC LIMIT ?",
+            (top,),
+        )
+        slices = []
+        for key, dataset, filters_json, year_key, years, month_key, months in cursor:
+            filters = json.loads(filters_json)
+            if years:
+                filters[year_key] = years
+            if months:
+                filters[month_key] = ",".join(str(int(month)) for month in _split(months))
+            slices.append((key, dataset, filters))
+        return slices
+
+
+_STORE: MirrorStore | None = None
+
+
+def get_mirror() -> MirrorStore | None:
+    global _STORE
+    if not settings.mirror_path:
+        return None
+    if _STORE is None:
+        _STORE = MirrorStore(settings.mirror_path, settings.mirror_max_age_hours * 3600)
+    return _STORE
+
+
+def _payload(result: Any) -> Any:
+    return getattr(result, "structured_content", None) or getattr(result, "data", None) or result
+
+
+def _load_pinned_slices(store: MirrorStore) -> None:
+    path = Path(settings.mirror_slices_path)
+    if not path.exists():
+        return
+    for entry in json.loads(path.read_text(encoding="utf-8")):
+        store.note_slice(entry["dataset"], entry["filters"])
+
+
+async def sync_mirror(top: int = 50) -> int:
+    from app.services.mcp_client import _candidate_urls, _configured_urls, open_client
+
+    store = get_mirror()
+    if store is None:
+        raise RuntimeError("MOSPI_MIRROR_PATH is not set")
+    _load_pinned_slices(store)
+    slices = store.slices_to_sync(top)
+    synced = 0
+    urls = _candidate_urls() or _configured_urls()
+    async with open_client(urls[0]) as client:
+        for key, dataset, filters in slices:
+            rows: list[dict[str, Any]] = []
+            page, total_pages = 1, 1
+            try:
+                while page <= total_pages:
+                    result = await client.call_tool(
+                        "4_get_data",
+                        {"dataset": dataset, "filters": {**filters, "limit": "100", "page": str(page)}},
+                    )
+                    payload = _payload(result)
+                    if not isinstance(payload, dict) or not isinstance(payload.get("data"), list):
+                        break
+                    rows.extend(row for row in payload["data"] if isinstance(row, dict))
+                    meta = payload.get("meta_data") or {}
+                    total_pages = int(meta.get("totalPages", 1)) if isinstance(meta, dict) else 1
+                    page += 1
+            except Exception:
+                logger.exception("Mirror sync failed for slice=%s", key)
+                continue
+            if rows:
+                store.replace_rows(key, rows)
+                synced += 1
+                logger.info("Mirrored slice=%s rows=%d", key, len(rows))
+    return synced
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mirror hot MoSPI Step-4 slices into the local store")
+    parser.add_argument("--top", type=int, default=50, help="number of most-requested slices to sync")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    synced = asyncio.run(sync_mirror(args.top))
+    print(f"Synced {synced} slices into {settings.mirror_path}")
+
+
+if __name__ == "__main__":
+    main()
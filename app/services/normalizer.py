@@ -161,3 +161,105 @@ def normalize_timeseries(payload: Any, filters: dict[str, Any] | None = None) ->
         }
 
     return {"series": series, "summary": summary}
+
+
+def lttb(points: list[dict[str, Any]], threshold: int) -> list[dict[str, Any]]:
+    # Largest-Triangle-Three-Buckets: keep both ends and, per bucket, the point spanning the largest
+    # triangle with its neighbours, so peaks and turning points survive the cut.
+    if threshold < 3 or len(points) <= threshold:
+        return points
+    values = [float(point["value"]) for point in points]
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, len(points))
+        if end >= next_end:
+            avg_x, avg_y = float(len(points) - 1), values[-1]
+        else:
+            avg_x = (end + next_end - 1) / 2
+            avg_y = sum(values[end:next_end]) / (next_end - end)
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs(
+                (anchor - avg_x) * (values[index] - values[anchor]) - (anchor - index) * (avg_y - values[anchor])
+            )
+            if area > best_area:
+                best, best_area = index, area
+        sampled.append(points[best])
+        anchor = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def _series_identity(row: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    identity = []
+    for key, value in row.items():
+        key_lower = key.lower()
+        if "year" in key_lower or "month" in key_lower or "quarter" in key_lower:
+            continue
+        if isinstance(value, (int, float)):
+            continue
+        try:
+            float(str(value))
+            continue
+        except ValueError:
+            identity.append((key, str(value)))
+    return tuple(sorted(identity))
+
+
+def downsample_rows(rows: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+    groups: dict[tuple[tuple[str, str], ...], list[tuple[str, dict[str, Any]]]] = {}
+    unplaced: list[dict[str, Any]] = []
+    for row in rows:
+        period = _find_year(row)
+        value = _find_value(row)
+        if period is None or value is None:
+            unplaced.append(row)
+            continue
+        groups.setdefault(_series_identity(row), []).append((period, {"value": value, "row": row}))
+    if all(len(members) <= budget for members in groups.values()):
+        return rows
+    sampled: list[dict[str, Any]] = []
+    for members in groups.values():
+        members.sort(key=lambda member: member[0])
+        sampled.extend(point["row"] for point in lttb([point for _, point in members], budget))
+    return sampled + unplaced
+
+
+class SeriesAccumulator:
+    def __init__(self, needed_periods: set[str] | None = None) -> None:
+        self.needed_periods = needed_periods or set()
+        self.periods: set[str] = set()
+        self._months: dict[str, set[str]] = {}
+        self._chunks: dict[int, list[dict[str, Any]]] = {}
+
+    def add(self, payload: Any, order: int = 0) -> None:
+        # Only rows are kept; the rest of the page payload can be released by the caller.
+        rows = _extract_rows(payload)
+        self._chunks.setdefault(order, []).extend(rows)
+        for row in rows:
+            period = _find_year(row)
+            if period:
+                self.periods.add(period)
+                if len(period) > 4:
+                    self._months.setdefault(period[:4], set()).add(period)
+
+    def _covers(self, period: str) -> bool:
+        if period in self.periods:
+            return True
+        # On monthly rows a year-only filter is covered by all twelve months, not by the first row of
+        # that year; later pages usually hold the rest of it.
+        return len(period) == 4 and len(self._months.get(period, ())) >= 12
+
+    def covers_needed(self) -> bool:
+        return bool(self.needed_periods) and all(self._covers(period) for period in self.needed_periods)
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        return [row for order in sorted(self._chunks) for row in self._chunks[order]]
+
+    def normalize(self, filters: dict[str, Any] | None = None) -> dict[str, Any]:
+        return normalize_timeseries(self.rows, filters)
@@ -0,0 +1,59 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("app.offload")
+
+T = TypeVar("T")
+
+# A dedicated pool so heavy parsing never queues behind (or starves) the loop's default executor.
+_POOL = ThreadPoolExecutor(max_workers=settings.offload_workers, thread_name_prefix="offload")
+
+
+def row_count(value: Any) -> int:
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(item) for item in value.values() if isinstance(item, list))
+    return 0
+
+
+def payload_size(value: Any) -> int:
+    # Rows across nested lists (Step-3 option lists, prompt payloads); the walk stops at the offload
+    # threshold since that is all the caller needs to know.
+    size = 0
+    stack = [value]
+    while stack and size < settings.offload_min_rows:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(child for child in item.values() if isinstance(child, (dict, list)))
+        elif isinstance(item, list):
+            size += len(item)
+            stack.extend(child for child in item if isinstance(child, (dict, list)))
+    return size
+
+
+async def run_sync(stage: str, size: int, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Small inputs are cheaper inline than the hop to a worker thread.
+    if size < settings.offload_min_rows:
+        return func(*args, **kwargs)
+    metrics.incr("offloaded", stage=stage)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, functools.partial(func, *args, **kwargs))
+
+
+def submit(func: Callable[..., Any], *args: Any) -> None:
+    # Fire-and-forget work whose result nobody waits for (debug dumps, store writes).
+    _POOL.submit(func, *args).add_done_callback(functools.partial(_log_failure, func))
+
+
+def _log_failure(func: Callable[..., Any], future: Future) -> None:
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        metrics.incr("offload_failed", func=getattr(func, "__qualname__", repr(func)))
+        logger.error("Offloaded %r failed", func, exc_info=error)
@@ -0,0 +1,68 @@
+from typing import Any, Iterator
+
+from app.services import fastjson
+
+PREVIEW_LIMIT = 500
+# Step-4 pages lead with the status fields so a preview never shows only the first rows.
+STEP4_PRIORITY_KEYS = ("msg", "meta_data", "error")
+
+
+def _chunks(value: Any, budget: int, priority: tuple[str, ...]) -> Iterator[str]:
+    # Depth-first and lazy: the caller stops pulling once it has enough, so nothing past the
+    # preview is ever serialized.
+    if isinstance(value, dict):
+        yield "{"
+        keys = [key for key in priority if key in value]
+        keys += [key for key in value if key not in priority]
+        for index, key in enumerate(keys):
+            if index:
+                yield ","
+            yield fastjson.dumps(key if isinstance(key, str) else str(key))
+            yield ":"
+            yield from _chunks(value[key], budget, priority)
+        yield "}"
+    elif isinstance(value, (list, tuple)):
+        yield "["
+        for index, item in enumerate(value):
+            if index:
+                yield ","
+            yield from _chunks(item, budget, priority)
+        yield "]"
+    elif isinstance(value, str) and len(value) > budget:
+        yield fastjson.dumps(value[:budget])
+    else:
+        yield fastjson.dumps(value)
+
+
+def preview_json(value: Any, limit: int = PREVIEW_LIMIT, priority: tuple[str, ...] = ()) -> str:
+    if isinstance(value, str):
+        raw = value[: limit + 1]
+    else:
+        parts: list[str] = []
+        size = 0
+        for chunk in _chunks(value, limit + 1, priority):
+            parts.append(chunk)
+            size += len(chunk)
+            if size > limit:
+                break
+        raw = "".join(parts)
+    if len(raw) <= limit:
+        return raw
+    return raw[: limit - 3] + "..."
+
+
+class RawPreview:
+    # Holds the payload and renders the rawJson preview only when a response is built.
+    __slots__ = ("value", "limit", "priority", "_rendered")
+
+    def __init__(self, value: Any, limit: int = PREVIEW_LIMIT, priority: tuple[str, ...] = ()) -> None:
+        self.value = value
+        self.limit = limit
+        self.priority = priority
+        self._rendered: str | None = None
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            self._rendered = preview_json(self.value, self.limit, self.priority)
+            self.value = None
+        return self._rendered
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from app.config import settings
+
+logger = logging.getLogger("app.prewarm")
+
+
+def load_warm_list() -> list[str]:
+    path = Path(settings.warm_claims_path)
+    if not path.exists():
+        return []
+    try:
+        claims = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logger.warning("Invalid warm list: %s", path)
+        return []
+    return [claim for claim in claims if isinstance(claim, str) and claim.strip()]
+
+
+async def prewarm_once(
+    run_claim: Callable[[str], Awaitable[Any]],
+    live_requests: Callable[[], int],
+) -> int:
+    warmed = 0
+    for claim in load_warm_list():
+        if live_requests() >= settings.prewarm_max_live_requests:
+            logger.info("Prewarm paused: %d live requests", live_requests())
+            break
+        task = asyncio.create_task(run_claim(claim))
+        # Live traffic always wins: give up on the warm run as soon as the threshold is crossed.
+        while not task.done():
+            await asyncio.wait({task}, timeout=0.25)
+            if not task.done() and live_requests() >= settings.prewarm_max_live_requests:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                logger.info("Prewarm cancelled claim=%r: %d live requests", claim, live_requests())
+                return warmed
+        if task.exception() is not None:
+            logger.warning("Prewarm failed claim=%r: %s", claim, task.exception())
+        else:
+            warmed += 1
+        await asyncio.sleep(settings.prewarm_pause_seconds)
+    return warmed
+
+
+async def prewarm_forever(
+    run_claim: Callable[[str], Awaitable[Any]],
+    live_requests: Callable[[], int],
+) -> None:
+    while True:
+        warmed = await prewarm_once(run_claim, live_requests)
+        logger.info("Prewarm round finished: %d claims warmed", warmed)
+        await asyncio.sleep(settings.prewarm_interval_seconds)
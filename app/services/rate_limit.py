@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger("app.rate_limit")
+
+# (bucket_start, previous_bucket_count, current_bucket_count)
+WindowState = tuple[float, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    bucket_start REAL NOT NULL,
+    previous INTEGER NOT NULL,
+    current INTEGER NOT NULL,
+    touched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rate_limits_touched ON rate_limits (touched);
+"""
+
+
+def sliding_window(
+    state: WindowState | None, now: float, limit: int, window: float
+) -> tuple[WindowState, bool, int]:
+    bucket = math.floor(now / window) * window
+    if state is None or bucket - state[0] > window:
+        previous, current = 0, 0
+    elif bucket == state[0]:
+        previous, current = state[1], state[2]
+    else:
+        previous, current = state[2], 0
+    # Weight the previous bucket by how much of it still overlaps the trailing window;
+    # this removes the 2x burst a fixed window allows at its edges.
+    elapsed = now - bucket
+    estimate = previous * (1 - elapsed / window) + current
+    if estimate + 1 > limit:
+        if current + 1 > limit or previous == 0:
+            retry_after = window - elapsed
+        else:
+            retry_after = window * (1 - (limit - 1 - current) / previous) - elapsed
+        return (bucket, previous, current), False, max(1, math.ceil(retry_after))
+    return (bucket, previous, current + 1), True, 0
+
+
+class RateLimitBackend(Protocol):
+    # Backends that touch disk are called from a worker thread instead of the event loop.
+    blocking: bool
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]: ...
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._states: OrderedDict[str, WindowState] = OrderedDict()
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        now = time.time()
+        with self._lock:
+            state, allowed, retry_after = sliding_window(self._states.get(key), now, limit, window)
+            self._states[key] = state
+            self._states.move_to_end(key)
+            self._evict(now, window)
+        return allowed, retry_after
+
+    def _evict(self, now: float, window: float) -> None:
+        # Least recently seen keys sit at the front: drop them while over the cap or fully expired.
+        while self._states:
+            key, (bucket_start, _, _) = next(iter(self._states.items()))
+            if len(self._states) <= self.max_keys and now - bucket_start < 2 * window:
+                break
+            del self._states[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+class SQLiteBackend:
+    blocking = True
+
+    def __init__(self, path: str, max_keys: int, busy_timeout: float, prune_every: int = 500) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.max_keys = max_keys
+        self.prune_every = prune_every
+        self._hits = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Autocommit mode so BEGIN IMMEDIATE serialises read-modify-write across workers.
+            self._conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            try:
+                db.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as exc:
+                # Another worker held the write lock past the short busy timeout: fail open rather than stall.
+                metrics.incr("rate_limit_fail_open")
+                logger.warning("Rate limit check skipped: %s", exc)
+                return True, 0
+            try:
+                row = db.execute(
+                    "SELECT bucket_start, previous, current FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                state, allowed, retry_after = sliding_window(row, now, limit, window)
+                db.execute(
+                    "INSERT INTO rate_limits (key, bucket_start, previous, current, touched) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET bucket_start = excluded.bucket_start, "
+                    "previous = excluded.previous, current = excluded.current, touched = excluded.touched",
+                    (key, *state, now),
+                )
+                self._hits += 1
+                if self._hits % self.prune_every == 0:
+                    self._prune(db, now, window)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return allowed, retry_after
+
+    def _prune(self, db: sqlite3.Connection, now: float, window: float) -> None:
+        db.execute("DELETE FROM rate_limits WHERE touched < ?", (now - 2 * window,))
+        db.execute(
+            "DELETE FROM rate_limits WHERE key IN "
+            "(SELECT key FROM rate_limits ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,),
+        )
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, window: float, per_ip: int, per_key: int) -> None:
+        self.backend = backend
+        self.window = window
+        self.per_ip = per_ip
+        self.per_key = per_key
+
+    async def check_ip(self, ip: str) -> tuple[bool, int]:
+        return await self._check("ip", f"ip:{ip}", self.per_ip)
+
+    async def check_api_key(self, api_key: str) -> tuple[bool, int]:
+        # Only a digest is tracked so the backend never holds the secret itself.
+        digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return await self._check("api_key", f"key:{digest}", self.per_key)
+
+    async def _check(self, scope: str, key: str, limit: int) -> tuple[bool, int]:
+        if limit <= 0:
+            return True, 0
+        if self.backend.blocking:
+            allowed, retry_after = await asyncio.to_thread(self.backend.hit, key, limit, self.window)
+        else:
+            allowed, retry_after = self.backend.hit(key, limit, self.window)
+        if not allowed:
+            metrics.incr("rate_limited", scope=scope)
+        return allowed, retry_after
+
+
+def _build_backend() -> RateLimitBackend:
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBackend(
+            settings.rate_limit_path, settings.rate_limit_max_keys, settings.rate_limit_busy_timeout_ms / 1000
+        )
+    return MemoryBackend(settings.rate_limit_max_keys)
+
+
+rate_limiter = RateLimiter(
+    _build_backend(),
+    settings.rate_limit_window_seconds,
+    settings.rate_limit_per_ip,
+    settings.rate_limit_per_key,
+)
@@ -0,0 +1,228 @@
+import asyncio
+import calendar
+import datetime
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from app.config import settings
+from app.services import fastjson, metrics, offload
+from app.services.offload import payload_size
+
+logger = logging.getLogger("app.refresh")
+
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+MONTHLY = tuple(range(1, 13))
+QUARTERLY = (2, 5, 8, 11)
+
+
+@dataclass(frozen=True)
+class Cadence:
+    # Months with an expected release, the day of month and the IST hour the press release goes out.
+    months: tuple[int, ...]
+    day: int
+    hour: int = 16
+
+
+# MoSPI's advance release calendar; override per deployment with MOSPI_RELEASE_CADENCES.
+DEFAULT_CADENCES = {
+    "CPI": Cadence(MONTHLY, 12),
+    "WPI": Cadence(MONTHLY, 14, hour=12),
+    "IIP": Cadence(MONTHLY, 28),
+    "PLFS": Cadence(QUARTERLY, 15),
+    "NAS": Cadence(QUARTERLY, 28),
+    "ASI": Cadence((12,), 31),
+    "ENERGY": Cadence((3,), 31),
+}
+
+
+def load_cadences() -> dict[str, Cadence]:
+    cadences = dict(DEFAULT_CADENCES)
+    path = Path(settings.release_cadences_path)
+    if not path.exists():
+        return cadences
+    try:
+        overrides = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logger.warning("Invalid release cadences: %s", path)
+        return cadences
+    for dataset, entry in overrides.items():
+        months = entry.get("months", "monthly")
+        if months == "monthly":
+            months = MONTHLY
+        elif months == "quarterly":
+            months = QUARTERLY
+        cadences[dataset.upper()] = Cadence(
+            tuple(int(month) for month in months), int(entry["day"]), int(entry.get("hour", 16))
+        )
+    return cadences
+
+
+def _release_at(cadence: Cadence, year: int, month: int) -> datetime.datetime:
+    day = min(cadence.day, calendar.monthrange(year, month)[1])
+    return datetime.datetime(year, month, day, cadence.hour, tzinfo=IST)
+
+
+def last_release(cadence: Cadence, now: float) -> float:
+    current = datetime.datetime.fromtimestamp(now, IST)
+    year, month = current.year, current.month
+    # Walk back at most a year; every cadence has at least one release month.
+    for _ in range(13):
+        if month in cadence.months:
+            released = _release_at(cadence, year, month).timestamp() + settings.refresh_grace_hours * 3600
+            if released <= now:
+                return released
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return 0.0
+
+
+def payload_hash(data: Any) -> str:
+    return hashlib.sha256(fastjson.dumps_bytes(data, sort_keys=True)).hexdigest()[:16]
+
+
+@dataclass
+class TrackedEntry:
+    tool: str
+    payload: dict[str, Any]
+    dataset: str
+    fetched_at: float
+    digest: str
+    recheck_at: float | None = None
+
+
+class RefreshScheduler:
+    def __init__(self, cadences: dict[str, Cadence], max_entries: int = 1024) -> None:
+        self.cadences = cadences
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, TrackedEntry] = OrderedDict()
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    async def track(self, key: str, tool: str, payload: dict[str, Any], data: Any, now: float | None = None) -> None:
+        dataset = str(payload.get("dataset", "")).upper()
+        # With refresh off nothing ever compares the digest, so the payload is not hashed at all.
+        if not settings.refresh_enabled or dataset not in self.cadences:
+            return
+        now = now or time.time()
+        digest = await offload.run_sync("refresh_hash", payload_size(data), payload_hash, data)
+        self._entries[key] = TrackedEntry(tool, payload, dataset, now, digest)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def released_since(self, dataset: Any, fetched_at: float, now: float | None = None) -> bool:
+        cadence = self.cadences.get(str(dataset or "").upper())
+        if cadence is None:
+            return False
+        return fetched_at < last_release(cadence, now or time.time())
+
+    def is_stale(self, key: str, now: float | None = None) -> bool:
+        # A cached payload is stale once an expected release has passed since it was fetched.
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return self.released_since(entry.dataset, entry.fetched_at, now)
+
+    def due(self, now: float | None = None) -> list[str]:
+        now = now or time.time()
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if self.is_stale(key, now) or (entry.recheck_at is not None and entry.recheck_at <= now)
+        ]
+        # Metadata first: it carries the newly available periods the Step-4 refreshes will ask for.
+        return sorted(keys, key=lambda key: self._entries[key].tool)
+
+    def record(self, key: str, digest: str, now: float | None = None) -> bool:
+        now = now or time.time()
+        entry = self._entries[key]
+        changed = digest != entry.digest
+        stats = self._stats.setdefault(
+            entry.dataset,
+            {"checks": 0, "changed": 0, "unchanged": 0, "last_changed_at": None, "release_lag_hours": None},
+        )
+        stats["checks"] += 1
+        release = last_release(self.cadences[entry.dataset], now)
+        if changed:
+            stats["changed"] += 1
+            stats["last_changed_at"] = now
+            # How long after the expected release the new figures actually appeared.
+            stats["release_lag_hours"] = round((now - release) / 3600, 1)
+            entry.recheck_at = None
+        else:
+            stats["unchanged"] += 1
+            # The release may simply be late; keep checking for a few days before waiting for the next one.
+            late = now - release < settings.refresh_recheck_days * 86400
+            entry.recheck_at = now + settings.refresh_recheck_hours * 3600 if late else None
+        entry.fetched_at = now
+        entry.digest = digest
+        metrics.incr("cache_refresh", dataset=entry.dataset, changed=str(changed).lower())
+        return changed
+
+    async def refresh_once(
+        self,
+        fetch: Callable[[str, str, dict[str, Any]], Awaitable[Any | None]],
+        live_requests: Callable[[], int],
+    ) -> int:
+        refreshed = 0
+        for key in self.due()[: settings.refresh_max_per_round]:
+            if live_requests() >= settings.prewarm_max_live_requests:
+                logger.info("Cache refresh paused: %d live requests", live_requests())
+                break
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            try:
+                data = await fetch(key, entry.tool, entry.payload)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Cache refresh failed key=%s: %s", key, exc)
+                metrics.incr("cache_refresh", dataset=entry.dataset, changed="error")
+            else:
+                if data is None:
+                    # Evicted from the cache since it was tracked; nothing left to keep fresh.
+                    self.forget(key)
+                    continue
+                digest = await offload.run_sync("refresh_hash", payload_size(data), payload_hash, data)
+                if key not in self._entries:
+                    # Pushed out of the tracker while the digest was computed.
+                    continue
+                if self.record(key, digest):
+                    logger.info("Upstream data changed dataset=%s tool=%s", entry.dataset, entry.tool)
+                refreshed += 1
+            # Refresh traffic is spread out so it never competes with live claims for MoSPI.
+            await asyncio.sleep(settings.refresh_min_interval_seconds)
+        return refreshed
+
+    async def refresh_forever(
+        self,
+        fetch: Callable[[str, str, dict[str, Any]], Awaitable[Any | None]],
+        live_requests: Callable[[], int],
+    ) -> None:
+        while True:
+            await asyncio.sleep(settings.refresh_check_interval_seconds)
+            refreshed = await self.refresh_once(fetch, live_requests)
+            if refreshed:
+                logger.info("Cache refresh round finished: %d entries revalidated", refreshed)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.time()
+        return {
+            "tracked": len(self._entries),
+            "due": len(self.due(now)),
+            "datasets": {
+                dataset: {"last_release": last_release(cadence, now), **self._stats.get(dataset, {})}
+                for dataset, cadence in self.cadences.items()
+            },
+        }
+
+
+refresh_scheduler = RefreshScheduler(load_cadences())
@@ -1,10 +1,14 @@
 import json
-from typing import Any
+from typing import Any, get_args
 
-import httpx
-from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from app.config import settings
+from app.models.schemas import ClaimType, SelectorAOutput
+from app.services import fastjson, offload
+from app.services.decision_cache import decision_key, decisions, payload_digest, prompt_version
+from app.services.llm import complete_json, validate_or_repair
+from app.services.offload import payload_size
 
 
 class SelectorAError(RuntimeError):
@@ -64,6 +68,9 @@ Return JSON schema:
 }
 """.strip()
 
+# Cached decisions are keyed on this, so editing the prompt invalidates them.
+PROMPT_VERSION = prompt_version("selector_a", _SYSTEM_PROMPT)
+
 
 def _normalize_params(dataset: str, params: dict[str, Any]) -> dict[str, str]:
     normalized: dict[str, str] = {}
@@ -80,53 +87,55 @@ def _normalize_params(dataset: str, params: dict[str, Any]) -> dict[str, str]:
     return normalized
 
 
-async def select_indicator_params(claim: str, dataset: str, step2: dict[str, Any]) -> dict[str, Any]:
+def _fix_output(dataset: str, parsed: dict[str, Any]) -> dict[str, Any]:
+    fixed = dict(parsed)
+    if isinstance(fixed.get("params"), dict):
+        fixed["params"] = _normalize_params(dataset, fixed["params"])
+    # Same default as the prompt: an unclear claim is treated as a trend so it keeps its multi-year series.
+    claim_type = str(fixed.get("claim_type") or "trend").strip().lower()
+    fixed["claim_type"] = claim_type if claim_type in get_args(ClaimType) else "trend"
+    return fixed
+
+
+async def select_indicator_params(
+    claim: str, dataset: str, step2: dict[str, Any], indicator_hint: str | None = None
+) -> dict[str, Any]:
     if not settings.openai_api_key:
         raise SelectorAError("OPENAI_API_KEY is not set")
 
-    if settings.openai_ssl_verify:
-        http_client = None
-    else:
-        http_client = httpx.AsyncClient(verify=False)
-
-    client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
-
-    response = await client.chat.completions.create(
-        model="gpt-4.1-mini",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": json.dumps(
-                    {
-                        "claim": claim,
-                        "dataset": dataset,
-                        "step2": step2,
-                    },
-                    ensure_ascii=True,
-                ),
-            },
-        ],
+    key = None
+    if indicator_hint:
+        step2_digest = await offload.run_sync("decision_key", payload_size(step2), payload_digest, step2)
+        key = decision_key("selector_a", PROMPT_VERSION, claim, indicator_hint, dataset, step2=step2_digest)
+    cached = decisions.get("selector_a", key)
+    if cached is not None:
+        return cached
+
+    content = await complete_json(
+        "selector_a",
+        _SYSTEM_PROMPT,
+        {
+            "claim": claim,
+            "dataset": dataset,
+            "step2": step2,
+        },
         temperature=0.1,
     )
-
-    content = response.choices[0].message.content
     if not content:
         raise SelectorAError("Empty response from selector A")
 
     try:
-        parsed = json.loads(content)
+        parsed = fastjson.loads(content)
     except json.JSONDecodeError as exc:
         raise SelectorAError("Selector A returned invalid JSON") from exc
-    finally:
-        if http_client is not None:
-            await http_client.aclose()
 
-    if "params" in parsed and isinstance(parsed["params"], dict):
-        parsed["params"] = _normalize_params(dataset, parsed["params"])
-
-    if "claim_type" not in parsed:
-        parsed["claim_type"] = "other"
-
-    return parsed
+    try:
+        validated = await validate_or_repair(
+            "selector_a", SelectorAOutput, parsed, lambda raw: _fix_output(dataset, raw)
+        )
+    except ValidationError as exc:
+        raise SelectorAError("Selector A returned output that does not match its schema") from exc
+
+    decision = validated.model_dump()
+    decisions.set(key, decision)
+    return decision
@@ -1,10 +1,17 @@
 import json
+from dataclasses import asdict
 from typing import Any
 
-import httpx
-from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from app.config import settings
+from app.models.schemas import SelectorBOutput
+from app.services import fastjson, offload
+from app.services.decision_cache import decision_key, decisions, payload_digest, prompt_version
+from app.services.filter_rules import option_names
+from app.services.llm import complete_json, validate_or_repair
+from app.services.offload import payload_size
+from app.services.time_scope import TimeScope
 
 
 class SelectorBError(RuntimeError):
@@ -33,6 +40,7 @@ Core rules:
 - Keep indicator params fixed to Selector-A’s choices.
 - Prefer the broadest valid defaults (All/Total/Combined, All-India) unless the claim specifies otherwise. Broadest means a SINGLE total/overall code, not a list of all codes.
 - Time range: pick the latest 3 years when Step-3 provides multiple years, unless the claim specifies a single year. Never collapse to one year if multiple are available.
+- If time_scope is given, the claim's years (and months) were already extracted and will be applied to the time fields after you answer; just include the time fields with any valid value.
 - If Step-3 exposes an aggregation/granularity field (e.g., level), you MUST include it and choose the highest aggregation that still matches the claim. Avoid lower-level filters unless explicitly mentioned.
 - Avoid subcategory filters (group/item/nic/etc.) unless the claim explicitly names them.
 - If Step-3 doesn’t mark required vs optional, choose the minimum set that still yields data.
@@ -54,6 +62,24 @@ Return schema:
 }
 """.strip()
 
+# Cached decisions are keyed on this, so editing the prompt invalidates them.
+PROMPT_VERSION = prompt_version("selector_b", _SYSTEM_PROMPT)
+
+
+def _fix_output(parsed: dict[str, Any]) -> dict[str, Any]:
+    fixed = dict(parsed)
+    if isinstance(fixed.get("filters"), dict):
+        fixed["filters"] = {key: str(value) for key, value in fixed["filters"].items()}
+    if isinstance(fixed.get("benchmark_filters"), dict) and fixed["benchmark_filters"]:
+        fixed["benchmark_filters"] = {key: str(value) for key, value in fixed["benchmark_filters"].items()}
+    else:
+        fixed["benchmark_filters"] = None
+    drops = fixed.get("optional_drop_filters")
+    if isinstance(drops, str):
+        drops = [drops]
+    fixed["optional_drop_filters"] = [str(item) for item in drops] if isinstance(drops, list) else []
+    return fixed
+
 
 async def select_filters(
     claim: str,
@@ -62,57 +88,62 @@ async def select_filters(
     step3: dict[str, Any],
     indicator_params: dict[str, Any],
     pagination_hint: str | None = None,
+    time_scope: TimeScope | None = None,
+    indicator_hint: str | None = None,
 ) -> dict[str, Any]:
     if not settings.openai_api_key:
         raise SelectorBError("OPENAI_API_KEY is not set")
 
-    if settings.openai_ssl_verify:
-        http_client = None
-    else:
-        http_client = httpx.AsyncClient(verify=False)
-
-    client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
-
-    response = await client.chat.completions.create(
-        model="gpt-4.1-mini",
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": json.dumps(
-                    {
-                        "claim": claim,
-                        "dataset": dataset,
-                        "claim_type": claim_type,
-                        "step3": step3,
-                        "indicator_params": indicator_params,
-                        "pagination_hint": pagination_hint,
-                    },
-                    ensure_ascii=True,
-                ),
-            },
-        ],
+    key = None
+    if indicator_hint:
+        size = payload_size(step3)
+        names = await offload.run_sync("decision_key", size, option_names, step3)
+        step3_digest = await offload.run_sync("decision_key", size, payload_digest, step3)
+        key = decision_key(
+            "selector_b",
+            PROMPT_VERSION,
+            claim,
+            indicator_hint,
+            dataset,
+            names,
+            claim_type=claim_type,
+            step3=step3_digest,
+            indicator_params=payload_digest(indicator_params),
+            pagination_hint=pagination_hint,
+            time_scope=asdict(time_scope) if time_scope is not None else None,
+        )
+    cached = decisions.get("selector_b", key)
+    if cached is not None:
+        return cached
+
+    content = await complete_json(
+        "selector_b",
+        _SYSTEM_PROMPT,
+        {
+            "claim": claim,
+            "dataset": dataset,
+            "claim_type": claim_type,
+            "step3": step3,
+            "indicator_params": indicator_params,
+            "pagination_hint": pagination_hint,
+            "time_scope": asdict(time_scope) if time_scope is not None else None,
+        },
         temperature=0.1,
+        claim_type=claim_type,
     )
-
-    content = response.choices[0].message.content
     if not content:
         raise SelectorBError("Empty response from selector B")
 
     try:
-        parsed = json.loads(content)
+        parsed = fastjson.loads(content)
     except json.JSONDecodeError as exc:
         raise SelectorBError("Selector B returned invalid JSON") from exc
-    finally:
-        if http_client is not None:
-            await http_client.aclose()
-
-    if "filters" in parsed and isinstance(parsed["filters"], dict):
-        parsed["filters"] = {key: str(value) for key, value in parsed["filters"].items()}
-    if "benchmark_filters" in parsed and isinstance(parsed["benchmark_filters"], dict):
-        parsed["benchmark_filters"] = {
-            key: str(value) for key, value in parsed["benchmark_filters"].items()
-        }
-
-    return parsed
+
+    try:
+        validated = await validate_or_repair("selector_b", SelectorBOutput, parsed, _fix_output)
+    except ValidationError as exc:
+        raise SelectorBError("Selector B returned output that does not match its schema") from exc
+
+    decision = validated.model_dump()
+    decisions.set(key, decision)
+    return decision
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any
+
+from app.config import settings
+from app.services import fastjson
+
+logger = logging.getLogger("app.snapshot")
+
+MAGIC = b"DTESNAP1"
+_HEADER_LEN = struct.Struct("<Q")
+
+
+def write_snapshot(path: str, entries: dict[str, Any]) -> None:
+    index: dict[str, list[int]] = {}
+    blobs: list[bytes] = []
+    offset = 0
+    for key, value in entries.items():
+        blob = fastjson.dumps_bytes(value)
+        index[key] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = fastjson.dumps_bytes(index)
+
+    # Write next to the target and rename so readers only ever see a complete file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(_HEADER_LEN.pack(len(header)))
+        handle.write(header)
+        for blob in blobs:
+            handle.write(blob)
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    def __init__(self, path: str, check_interval: float = 5.0) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self.generation = 0
+        self._signature: tuple[int, int] | None = None
+        self._checked_at = 0.0
+        self._map: mmap.mmap | None = None
+        self._index: dict[str, list[int]] = {}
+        self._data_start = 0
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._map is not None:
+            return
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature == self._signature:
+            return
+        with open(self.path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(MAGIC)] != MAGIC:
+            mapped.close()
+            logger.warning("Ignoring snapshot with bad header: %s", self.path)
+            return
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        (header_len,) = _HEADER_LEN.unpack(mapped[len(MAGIC) : header_start])
+        index = fastjson.loads(mapped[header_start : header_start + header_len])
+
+        previous = self._map
+        self._map, self._index = mapped, index
+        self._data_start = header_start + header_len
+        self._signature = signature
+        self.generation += 1
+        if previous is not None:
+            previous.close()
+        logger.info("Loaded catalog snapshot generation=%d entries=%d", self.generation, len(index))
+
+    @property
+    def built_at(self) -> float:
+        # Wall-clock time the loaded snapshot file was written.
+        self._maybe_reload()
+        return self._signature[1] / 1e9 if self._signature is not None else 0.0
+
+    def get(self, key: str) -> Any | None:
+        self._maybe_reload()
+        location = self._index.get(key)
+        if self._map is None or location is None:
+            return None
+        start = self._data_start + location[0]
+        # Pages stay shared in the OS page cache; only the entry being read is decoded.
+        return fastjson.loads(self._map[start : start + location[1]])
+
+    def __len__(self) -> int:
+        self._maybe_reload()
+        return len(self._index)
+
+
+_READER: SnapshotReader | None = None
+
+
+def get_snapshot() -> SnapshotReader | None:
+    global _READER
+    if not settings.snapshot_path:
+        return None
+    if _READER is None:
+        _READER = SnapshotReader(settings.snapshot_path)
+    return _READER
+
+
+async def build_snapshot() -> int:
+    from app.routers.claims import export_catalogs, resolve_claim
+    from app.services.prewarm import load_warm_list
+
+    # Running the warm list in the parent fills Step-1/2/3 with exactly the keys live traffic uses.
+    for claim in load_warm_list():
+        try:
+            await resolve_claim(claim)
+        except Exception:
+            logger.exception("Snapshot warm-up failed for claim=%r", claim)
+    entries = export_catalogs()
+    write_snapshot(settings.snapshot_path, entries)
+    return len(entries)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    count = asyncio.run(build_snapshot())
+    print(f"Wrote {count} catalog entries to {settings.snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.mirror import _is_year_key
+from app.services.normalizer import _find_year
+
+# The MoSPI API accepts comma-separated years, but long lists page badly.
+MAX_MERGED_YEARS = 5
+
+
+@dataclass
+class PlannedCall:
+    filters: dict[str, Any]
+    # (label, index into that label's expanded filter list) for every logical set this call serves.
+    targets: list[tuple[str, int]] = field(default_factory=list)
+    # Already executed in an earlier phase: it can serve subsumed sets but must not be widened.
+    done: bool = False
+
+
+def _year_key(filters: dict[str, Any]) -> str | None:
+    return next((key for key in filters if _is_year_key(key)), None)
+
+
+def _years(value: Any) -> list[str]:
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def _identity(filters: dict[str, Any], year_key: str | None) -> str:
+    return repr(sorted((key, str(value)) for key, value in filters.items() if key != year_key))
+
+
+def plan_step4(
+    requests: dict[str, list[dict[str, Any]]],
+    executed: list[dict[str, Any]] | None = None,
+) -> list[PlannedCall]:
+    plan: list[PlannedCall] = []
+    # Calls that differ only in their year list share an identity and can be merged.
+    by_identity: dict[str, list[PlannedCall]] = {}
+    for filters in executed or []:
+        done = PlannedCall(filters=filters, done=True)
+        by_identity.setdefault(_identity(filters, _year_key(filters)), []).append(done)
+    for label, filter_sets in requests.items():
+        for index, filters in enumerate(filter_sets):
+            year_key = _year_key(filters)
+            identity = _identity(filters, year_key)
+            wanted = _years(filters[year_key]) if year_key else []
+            target = (label, index)
+            for call in by_identity.get(identity, []):
+                if year_key is None:
+                    # No time dimension: only an identical call can serve it.
+                    call.targets.append(target)
+                    break
+                have = _years(call.filters[year_key])
+                merged = have + [year for year in wanted if year not in have]
+                if len(merged) == len(have) or (not call.done and len(merged) <= MAX_MERGED_YEARS):
+                    # Subsumed sets leave the call unchanged; overlapping ones widen its year list.
+                    if len(merged) > len(have):
+                        call.filters = {**call.filters, year_key: ",".join(sorted(merged))}
+                    call.targets.append(target)
+                    break
+            else:
+                call = PlannedCall(filters=dict(filters), targets=[target])
+                by_identity.setdefault(identity, []).append(call)
+                plan.append(call)
+                continue
+            if call.done and call not in plan:
+                plan.append(call)
+    return plan
+
+
+def route_rows(rows: list[dict[str, Any]], logical: dict[str, Any], planned: dict[str, Any]) -> list[dict[str, Any]]:
+    year_key = _year_key(logical)
+    if year_key is None or logical.get(year_key) == planned.get(year_key):
+        return rows
+    wanted = {year[:4] for year in _years(logical[year_key])}
+    routed = []
+    for row in rows:
+        year = _find_year(row)
+        # Rows without a recognisable year cannot be attributed, so every series keeps them.
+        if year is None or year[:4] in wanted:
+            routed.append(row)
+    return routed
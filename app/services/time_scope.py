@@ -0,0 +1,157 @@
+import datetime
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.mirror import MONTH_KEYS, _is_year_key
+from app.services.normalizer import MONTH_NAME_TO_NUM
+
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+REL_TIME_RE = re.compile(
+    r"\b(years? ago|decades? ago|decade|decades|since|in the '?\d{2}s|(?:last|past) \w+ years)\b", re.IGNORECASE
+)
+
+_NUMBER_WORDS = {
+    "a": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "fifteen": 15, "twenty": 20,
+}
+_COUNT = r"(\d{1,2}|" + "|".join(_NUMBER_WORDS) + r")"
+_YEAR = r"((?:19|20)\d{2})"
+
+RANGE_RE = re.compile(
+    rf"\b(?:between\s+{_YEAR}\s+and\s+{_YEAR}|(?:from\s+)?{_YEAR}\s*(?:-|–|to|until|till|through)\s*{_YEAR})\b",
+    re.IGNORECASE,
+)
+# "since the 1991 reforms": a few words may sit between "since" and the year.
+SINCE_RE = re.compile(rf"\bsince\s+(?:[a-z'’-]+\s+){{0,4}}?{_YEAR}\b", re.IGNORECASE)
+DECADE_RE = re.compile(r"\b(?:the\s+)?(?:'?(\d{2})|((?:19|20)\d)0)s\b", re.IGNORECASE)
+AGO_RE = re.compile(rf"\b{_COUNT}\s+(years?|decades?)\s+ago\b", re.IGNORECASE)
+LAST_RE = re.compile(rf"\b(?:last|past)\s+{_COUNT}\s+years\b", re.IGNORECASE)
+MONTH_BY_ABBR = {name[:3]: number for name, number in MONTH_NAME_TO_NUM.items()}
+MONTH_YEAR_RE = re.compile(
+    r"\b(" + "|".join(MONTH_BY_ABBR) + r")[a-z]*\.?\s+" + _YEAR + r"\b", re.IGNORECASE
+)
+# A trailing two-digit year that follows on from the first is a fiscal year ("2023-24"), not a range.
+FISCAL_RE = re.compile(rf"\b{_YEAR}-(\d{{2}})\b")
+
+MAX_SCOPE_YEARS = 5
+RELATIVE_KINDS = {"since", "ago", "last"}
+
+
+@dataclass
+class TimeScope:
+    kind: str
+    years: list[int]
+    months: list[int] = field(default_factory=list)
+
+
+def _count(token: str) -> int:
+    return int(token) if token.isdigit() else _NUMBER_WORDS[token.lower()]
+
+
+def _span(start: int, end: int) -> list[int]:
+    start, end = min(start, end), max(start, end)
+    return list(range(start, end + 1))
+
+
+def _thin(years: list[int], limit: int = MAX_SCOPE_YEARS) -> list[int]:
+    # Keep both endpoints of long spans and spread the rest evenly; trends are judged end to end.
+    if len(years) <= limit:
+        return years
+    step = (len(years) - 1) / (limit - 1)
+    return sorted({years[round(i * step)] for i in range(limit)})
+
+
+def parse_time_scope(claim: str, today: datetime.date | None = None) -> TimeScope | None:
+    if not YEAR_RE.search(claim) and not REL_TIME_RE.search(claim) and not DECADE_RE.search(claim):
+        return None
+    current = (today or datetime.date.today()).year
+
+    if match := RANGE_RE.search(claim):
+        start, end = (int(group) for group in match.groups() if group)
+        return TimeScope("range", _thin(_span(start, end)))
+    if match := SINCE_RE.search(claim):
+        return TimeScope("since", _thin(_span(int(match.group(1)), current)))
+    if match := AGO_RE.search(claim):
+        back = _count(match.group(1)) * (10 if match.group(2).lower().startswith("decade") else 1)
+        return TimeScope("ago", [current - back, current])
+    if match := LAST_RE.search(claim):
+        return TimeScope("last", _thin(_span(current - _count(match.group(1)) + 1, current)))
+    if match := DECADE_RE.search(claim):
+        if match.group(2):
+            start = int(match.group(2)) * 10
+        else:
+            short = int(match.group(1))
+            start = (1900 if short >= 30 else 2000) + short
+        return TimeScope("decade", _thin(_span(start, start + 9)))
+
+    months = sorted({int(MONTH_BY_ABBR[m.group(1).lower()]) for m in MONTH_YEAR_RE.finditer(claim)})
+    fiscal = {int(m.group(1)) for m in FISCAL_RE.finditer(claim) if int(m.group(2)) == (int(m.group(1)) + 1) % 100}
+    years = sorted({int(m.group(0)) for m in YEAR_RE.finditer(claim)} - {year + 1 for year in fiscal})
+    if not years:
+        return None
+    return TimeScope("explicit", _thin(years), months)
+
+
+def _available_years(step3_payload: Any, year_key: str) -> list[str]:
+    data = step3_payload.get("data") if isinstance(step3_payload, dict) else None
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        data = data[0]
+    values = data.get(year_key) if isinstance(data, dict) else None
+    if not isinstance(values, list):
+        return []
+    available = []
+    for entry in values:
+        if isinstance(entry, dict):
+            entry = entry.get(year_key) or next(iter(entry.values()), None)
+        if entry is not None and YEAR_RE.match(str(entry)):
+            available.append(str(entry))
+    return available
+
+
+def _format_year(year: int, available: list[str], sample: str) -> str | None:
+    if available:
+        return next((value for value in available if value.startswith(str(year))), None)
+    if FISCAL_RE.fullmatch(sample):
+        return f"{year}-{(year + 1) % 100:02d}"
+    return str(year)
+
+
+def _anchor(scope: TimeScope, latest: int) -> list[int]:
+    if scope.kind == "since":
+        # The start year is the claim's own; only "now" moves.
+        return _thin(_span(scope.years[0], latest)) if scope.years[0] <= latest else []
+    shift = scope.years[-1] - latest
+    return [year - shift for year in scope.years]
+
+
+def apply_time_scope(
+    filters: dict[str, Any], scope: TimeScope | None, step3_payload: dict[str, Any]
+) -> dict[str, Any]:
+    if scope is None:
+        return filters
+    api_params = step3_payload.get("api_params", []) if isinstance(step3_payload, dict) else []
+    param_names = [p["name"] for p in api_params if p.get("name")]
+    year_key = next((key for key in [*filters, *param_names] if _is_year_key(key)), None)
+    if year_key is None:
+        return filters
+
+    chosen = [part.strip() for part in str(filters.get(year_key, "")).split(",") if part.strip()]
+    sample = chosen[0] if chosen else ""
+    available = _available_years(step3_payload, year_key)
+    wanted = scope.years
+    published = available or chosen
+    latest = max((int(value[:4]) for value in published if value[:4].isdigit()), default=None)
+    if latest is not None and scope.kind in RELATIVE_KINDS and wanted[-1] > latest:
+        # "Now" means the latest published year; move the window back rather than shrinking it.
+        wanted = _anchor(scope, latest)
+    years = [value for year in wanted if (value := _format_year(year, available, sample))]
+    if not years:
+        # None of the claimed years are published; leave Selector-B's choice alone.
+        return filters
+    pinned = {**filters, year_key: ",".join(dict.fromkeys(years))}
+
+    month_key = next((key for key in [*filters, *param_names] if key.lower() in MONTH_KEYS), None)
+    if scope.months and month_key is not None:
+        pinned[month_key] = ",".join(str(month) for month in scope.months)
+    return pinned
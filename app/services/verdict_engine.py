@@ -0,0 +1,181 @@
+import re
+from typing import Any
+
+from app.services.normalizer import _extract_rows, _find_value, _find_year, _match_filters, normalize_timeseries
+
+
+UP_RE = re.compile(
+    r"\b(rise|rises|rising|risen|rose|increas\w*|grow|grows|growing|grown|grew|up|higher|climb\w*|doubl\w*|tripl\w*)\b",
+    re.IGNORECASE,
+)
+DOWN_RE = re.compile(
+    r"\b(fall|falls|falling|fallen|fell|declin\w*|drop\w*|decreas\w*|down|lower|shrink\w*|shrank|halv\w*)\b",
+    re.IGNORECASE,
+)
+# "Growth is slowing" and "inflation is falling" are about a rate of change; the level series
+# (GDP, the CPI index) cannot settle their direction.
+GROWTH_RATE_RE = re.compile(r"\b(growth|inflation)\b", re.IGNORECASE)
+# "Lower than 5%" or "lower in 2019" compares against a number or a past period, not the series' direction.
+COMPARATIVE_RE = re.compile(r"\b(higher|lower)\b", re.IGNORECASE)
+ANCHOR_RE = re.compile(r"\b(than|ago|before|back then|used to|in (?:19|20)\d{2})\b", re.IGNORECASE)
+NEGATION_RE = re.compile(r"\b(not|no longer|never|isn't|aren't|hasn't|haven't|didn't|won't)\b", re.IGNORECASE)
+INTENSITY_RE = re.compile(
+    r"\b(out of control|skyrocket\w*|soar\w*|explod\w*|crisis|crash\w*|collaps\w*|dead|dying)\b",
+    re.IGNORECASE,
+)
+MULTIPLE_RE = re.compile(r"\b(doubl\w*|tripl\w*|halv\w*)\b", re.IGNORECASE)
+THRESHOLD_RE = re.compile(
+    r"\b(above|over|more than|exceeds?|exceeding|below|under|less than)\s+(\d+(?:\.\d+)?)(?:\s*(%|per ?cent))?"
+    r"(?:\s+([a-z]+))?",
+    re.IGNORECASE,
+)
+# A threshold in these units cannot be read off a series whose unit the rule engine does not know.
+SCALE_WORDS = {
+    "thousand", "lakh", "lakhs", "crore", "crores", "million", "millions", "billion", "billions",
+    "trillion", "trillions", "rupees", "rs", "inr", "dollars", "usd", "people", "persons", "workers",
+    "jobs", "tonnes", "units",
+}
+RATE_LABEL_RE = re.compile(r"\b(rate|ratio|share|percent\w*|per cent|lfpr|wpr)\b|%", re.IGNORECASE)
+
+# Relative change (in %) below which a series is treated as flat.
+FLAT_CHANGE_PCT = 2.0
+# Share of year-on-year moves that must agree with the overall direction for a clean verdict.
+MIN_CONSISTENCY = 0.5
+MULTIPLE_TARGETS = {"doubl": 2.0, "tripl": 3.0, "halv": 0.5}
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
+
+
+def claim_direction(claim: str) -> str | None:
+    # Intensity claims ("out of control", "crisis") are not settled by direction alone.
+    if NEGATION_RE.search(claim) or INTENSITY_RE.search(claim) or GROWTH_RATE_RE.search(claim):
+        return None
+    if COMPARATIVE_RE.search(claim) and ANCHOR_RE.search(claim):
+        return None
+    up = bool(UP_RE.search(claim))
+    down = bool(DOWN_RE.search(claim))
+    if up == down:
+        return None
+    return "up" if up else "down"
+
+
+def _is_clean(rows: list[dict[str, Any]], series: list[dict[str, Any]]) -> bool:
+    # Several rows per period means the filters left more than one series in the payload.
+    usable = [row for row in rows if _find_year(row) is not None and _find_value(row) is not None]
+    return bool(series) and len(usable) == len(series)
+
+
+def _chart(series: list[dict[str, Any]], label: str) -> list[dict[str, Any]]:
+    return [{"year": point["year"], "value": point["value"], "label": label} for point in series]
+
+
+def _trend_verdict(claim: str, series: list[dict[str, Any]], label: str) -> dict[str, Any] | None:
+    if len(series) < 2:
+        return None
+    direction = claim_direction(claim)
+    if direction is None:
+        return None
+
+    first, last = series[0], series[-1]
+    if first["value"] == 0:
+        return None
+    change_pct = (last["value"] - first["value"]) / abs(first["value"]) * 100
+    headline = (
+        f"{label} moved from {_fmt(first['value'])} in {first['year']} "
+        f"to {_fmt(last['value'])} in {last['year']} ({change_pct:+.1f}%)"
+    )
+
+    multiple = MULTIPLE_RE.search(claim)
+    if multiple:
+        target = next(v for k, v in MULTIPLE_TARGETS.items() if multiple.group(1).lower().startswith(k))
+        ratio = last["value"] / first["value"]
+        if (target > 1 and ratio >= target * 0.95) or (target < 1 and ratio <= target * 1.05):
+            verdict = "confirmed"
+        elif (target > 1 and ratio < 1 + (target - 1) * 0.5) or (target < 1 and ratio > 1 - (1 - target) * 0.5):
+            verdict = "busted"
+        else:
+            verdict = "complicated"
+        return {
+            "verdict": verdict,
+            "headlineStat": headline,
+            "basis": f"claimed a {target:g}x change; observed ratio {ratio:.2f}",
+        }
+
+    if abs(change_pct) < FLAT_CHANGE_PCT:
+        verdict = "busted"
+        basis = f"claimed {direction} but the series is flat ({change_pct:+.1f}%)"
+    else:
+        observed = "up" if change_pct > 0 else "down"
+        moves = [b["value"] - a["value"] for a, b in zip(series, series[1:])]
+        agreeing = sum(1 for move in moves if (move > 0) == (observed == "up") and move != 0)
+        consistency = agreeing / len(moves)
+        if observed != direction:
+            verdict = "busted"
+        elif consistency < MIN_CONSISTENCY:
+            verdict = "complicated"
+        else:
+            verdict = "confirmed"
+        basis = (
+            f"claimed {direction}; observed {observed} {change_pct:+.1f}% "
+            f"with {agreeing}/{len(moves)} periods moving {observed}"
+        )
+    return {"verdict": verdict, "headlineStat": headline, "basis": basis}
+
+
+def _level_verdict(claim: str, series: list[dict[str, Any]], label: str) -> dict[str, Any] | None:
+    match = THRESHOLD_RE.search(claim)
+    if not match or NEGATION_RE.search(claim):
+        return None
+    comparator = match.group(1).lower()
+    threshold = float(match.group(2))
+    percent, unit = match.group(3), (match.group(4) or "").lower()
+    # "5%" only means something against a rate; "5 crore" or "5 trillion dollars" against nothing we can check.
+    if percent and not RATE_LABEL_RE.search(label):
+        return None
+    if not percent and unit in SCALE_WORDS:
+        return None
+    latest = series[-1]
+    above = comparator in {"above", "over", "more than", "exceed", "exceeds", "exceeding"}
+    holds = latest["value"] > threshold if above else latest["value"] < threshold
+    # Within 2% of the threshold the rounding of the published figure decides; let the LLM weigh in.
+    if threshold and abs(latest["value"] - threshold) / threshold * 100 < FLAT_CHANGE_PCT:
+        return None
+    return {
+        "verdict": "confirmed" if holds else "busted",
+        "headlineStat": f"{label} was {_fmt(latest['value'])} in {latest['year']} (claim: {comparator} {_fmt(threshold)})",
+        "basis": f"latest value {_fmt(latest['value'])} vs claimed {comparator} {_fmt(threshold)}",
+    }
+
+
+def evaluate_claim(
+    claim: str,
+    claim_type: str,
+    data_rows: Any,
+    filters: dict[str, Any] | None,
+    label: str,
+) -> dict[str, Any] | None:
+    if claim_type not in ("trend", "level"):
+        return None
+    rows = _match_filters(_extract_rows(data_rows), filters or {})
+    series = normalize_timeseries(rows)["series"]
+    if not _is_clean(rows, series):
+        return None
+
+    if claim_type == "trend":
+        result = _trend_verdict(claim, series, label)
+    else:
+        result = _level_verdict(claim, series, label) or _trend_verdict(claim, series, label)
+    if result is None:
+        return None
+    result["chartData"] = _chart(series, label)
+    return result
+
+
+def full_chart(data_rows: Any, filters: dict[str, Any] | None, label: str | None) -> list[dict[str, Any]] | None:
+    rows = _match_filters(_extract_rows(data_rows), filters or {})
+    series = normalize_timeseries(rows)["series"]
+    if not _is_clean(rows, series):
+        return None
+    return _chart(series, label)
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from app.config import settings
+from app.services import offload
+from app.services.cache import TTLCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    verdict_id TEXT PRIMARY KEY,
+    content_json TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS verdicts_created ON verdicts (created_at);
+"""
+# The id covers what the verdict says, not how long each step took or the raw previews.
+IDENTITY_FIELDS = ("verdict", "headlineStat", "explanation", "source", "chartData")
+PRUNE_EVERY = 100
+
+
+def verdict_id(content: dict[str, Any], dataset: str | None = None, filters: dict[str, Any] | None = None) -> str:
+    body = {key: content.get(key) for key in IDENTITY_FIELDS}
+    body["dataset"] = dataset
+    body["filters"] = filters
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("ascii")).hexdigest()[:20]
+
+
+class VerdictStore:
+    def __init__(self, path: str, max_rows: int) -> None:
+        self.path = path
+        self.max_rows = max_rows
+        self._recent = TTLCache(max_entries=2048, ttl=24 * 3600)
+        self._conn: sqlite3.Connection | None = None
+        # Writes run on the offload pool; one connection is shared, so access is serialized.
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection | None:
+        if not self.path:
+            return None
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def put(self, content: dict[str, Any], dataset: str | None = None, filters: dict[str, Any] | None = None) -> str:
+        key = verdict_id(content, dataset, filters)
+        stored = {**content, "verdictId": key}
+        # The in-process cache answers reads until the background write lands.
+        self._recent.set(key, stored)
+        if self.path:
+            offload.submit(self._write, key, stored)
+        return key
+
+    def _write(self, key: str, stored: dict[str, Any]) -> None:
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR IGNORE INTO verdicts (verdict_id, content_json, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(stored, ensure_ascii=True), time.time()),
+                )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._prune(db)
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        # Oldest verdicts go first once the table is over its cap.
+        with db:
+            db.execute(
+                "DELETE FROM verdicts WHERE verdict_id IN "
+                "(SELECT verdict_id FROM verdicts ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        cached = self._recent.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return None
+            row = db.execute("SELECT content_json FROM verdicts WHERE verdict_id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        content = json.loads(row[0])
+        self._recent.set(key, content)
+        return content
+
+
+verdict_store = VerdictStore(settings.verdict_store_path, settings.verdict_store_max_rows)
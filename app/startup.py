@@ -0,0 +1,38 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+logger = logging.getLogger("app.startup")
+
+BOOT_START = time.perf_counter()
+_PHASES: dict[str, float] = {}
+_FIRST_REQUEST: float | None = None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _PHASES[name] = time.perf_counter() - start
+
+
+def mark_first_request() -> None:
+    global _FIRST_REQUEST
+    if _FIRST_REQUEST is None:
+        _FIRST_REQUEST = time.perf_counter() - BOOT_START
+        logger.info("Startup: first request served %.3fs after boot", _FIRST_REQUEST)
+
+
+def report() -> dict[str, Any]:
+    return {
+        "phases": {name: round(seconds, 4) for name, seconds in _PHASES.items()},
+        "first_request_seconds": None if _FIRST_REQUEST is None else round(_FIRST_REQUEST, 4),
+    }
+
+
+def log_report() -> None:
+    for name, seconds in sorted(_PHASES.items(), key=lambda item: -item[1]):
+        logger.info("Startup: %s took %.3fs", name, seconds)
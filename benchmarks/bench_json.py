@@ -0,0 +1,84 @@
+import gzip
+import json
+import random
+import timeit
+
+from app.services import fastjson
+from app.services.preview import preview_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATES = ["All India", "Maharashtra", "Tamil Nadu", "Uttar Pradesh", "West Bengal", "Karnataka", "Bihar"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+
+
+def cpi_rows(count: int) -> list[dict]:
+    rng = random.Random(1)
+    return [
+        {
+            "base_year": "2012",
+            "series": "Current",
+            "year": 2014 + i // 120,
+            "month": MONTHS[i % 12],
+            "state": STATES[i % len(STATES)],
+            "sector": ["Rural", "Urban", "Combined"][i % 3],
+            "division": "Food and beverages",
+            "index": round(rng.uniform(110, 210), 1),
+            "status": "Final",
+        }
+        for i in range(count)
+    ]
+
+
+def plfs_rows(count: int) -> list[dict]:
+    rng = random.Random(2)
+    return [
+        {
+            "year": f"{2017 + i % 7}-{18 + i % 7}",
+            "frequency": "Annual",
+            "indicator": "Unemployment Rate (UR) (in per cent)",
+            "state": STATES[i % len(STATES)],
+            "gender": ["male", "female", "person"][i % 3],
+            "sector": ["rural", "urban", "rural + urban"][i % 3],
+            "AgeGroup": "15-29 years",
+            "weekly_status": "CWS",
+            "religion": "all",
+            "social_group": "all",
+            "education": "all",
+            "quarter": "",
+            "value": round(rng.uniform(2, 25), 1),
+            "unit": "percent",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(name: str, payload: dict) -> None:
+    number = 50
+    std_dump = timeit.timeit(lambda: json.dumps(payload).encode("utf-8"), number=number) / number
+    fast_dump = timeit.timeit(lambda: fastjson.dumps_bytes(payload), number=number) / number
+    raw = fastjson.dumps_bytes(payload)
+    std_load = timeit.timeit(lambda: json.loads(raw), number=number) / number
+    fast_load = timeit.timeit(lambda: fastjson.loads(raw), number=number) / number
+    sizes = f"raw={len(raw)}B gzip={len(gzip.compress(raw, compresslevel=6))}B"
+    if brotli is not None:
+        sizes += f" br={len(brotli.compress(raw, quality=5))}B"
+    print(f"{name}: {sizes}")
+    print(f"  dumps  json={std_dump * 1e3:.2f}ms {fastjson.BACKEND}={fast_dump * 1e3:.2f}ms")
+    print(f"  loads  json={std_load * 1e3:.2f}ms {fastjson.BACKEND}={fast_load * 1e3:.2f}ms")
+    full_preview = timeit.timeit(lambda: fastjson.dumps(payload)[:500], number=number) / number
+    bounded_preview = timeit.timeit(lambda: preview_json(payload), number=number) / number
+    print(f"  rawJson preview  full dump={full_preview * 1e3:.2f}ms bounded={bounded_preview * 1e3:.3f}ms")
+
+
+def main() -> None:
+    for rows in (100, 2000):
+        bench(f"CPI {rows} rows", {"data": cpi_rows(rows), "meta_data": {"totalPages": 1}})
+        bench(f"PLFS {rows} rows", {"data": plfs_rows(rows), "meta_data": {"totalPages": 1}})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, EndpointBreaker, EndpointRouter
+
+
+def _clock(monkeypatch, start: float = 100.0) -> list[float]:
+    now = [start]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_the_failure_threshold(monkeypatch):
+    _clock(monkeypatch)
+    breaker = EndpointBreaker("a", failure_threshold=2, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+
+def test_half_open_lets_a_single_trial_through(monkeypatch):
+    now = _clock(monkeypatch)
+    breaker = EndpointBreaker("a", failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    now[0] += 30.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_failed_trial_reopens_for_a_full_timeout(monkeypatch):
+    now = _clock(monkeypatch)
+    breaker = EndpointBreaker("a", failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    now[0] += 30.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    now[0] += 29.0
+    assert breaker.state == OPEN
+
+
+def test_released_trial_can_be_retried(monkeypatch):
+    now = _clock(monkeypatch)
+    breaker = EndpointBreaker("a", failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    now[0] += 30.0
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.state == HALF_OPEN and breaker.allow_request()
+
+
+def test_router_prefers_the_last_good_url_and_skips_open_ones(monkeypatch):
+    _clock(monkeypatch)
+    router = EndpointRouter(failure_threshold=1, reset_timeout=30.0)
+    router.record_success("b")
+    assert router.ordered(["a", "b", "c"]) == ["b", "a", "c"]
+    router.record_failure("b")
+    assert router.last_good is None
+    assert router.ordered(["a", "b", "c"]) == ["a", "c"]
+    assert router.snapshot()["endpoints"]["b"] == {"state": OPEN, "failures": 1}
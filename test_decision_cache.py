@@ -0,0 +1,36 @@
+from app.services.decision_cache import decision_key
+
+
+def _key(claim: str) -> str:
+    return decision_key("selector_b", "v1", claim, "consumer price index", "CPI")
+
+
+def test_synonymous_claims_share_a_key():
+    assert _key("Prices rose in 2023") == _key("Prices increased in 2023")
+
+
+def test_opposite_direction_gets_its_own_key():
+    assert _key("Prices rose in 2023") != _key("Prices fell in 2023")
+
+
+def test_threshold_gets_its_own_key():
+    assert _key("Prices rose in 2023") != _key("Prices rose above 5% in 2023")
+
+
+def test_comparison_order_is_part_of_the_key():
+    def key(claim: str) -> str:
+        return decision_key("selector_b", "v1", claim, "unemployment rate", "PLFS")
+
+    assert key("Rural unemployment is higher than urban") != key("Urban unemployment is higher than rural")
+    assert key("Unemployment among women is higher than men") != key("Unemployment among men is higher than women")
+    assert key("Rural unemployment is higher than urban") != key("Rural unemployment is lower than urban")
+    assert key("Rural unemployment is higher than urban") == key("rural unemployment is higher than urban")
+
+
+def test_named_places_get_their_own_key():
+    def key(claim: str) -> str:
+        return decision_key("selector_b", "v1", claim, "unemployment rate", "PLFS", ["Kerala", "Bihar"])
+
+    assert key("Kerala has high unemployment") != key("Bihar has high unemployment")
+    assert key("kerala has high unemployment") != key("bihar has high unemployment")
+    assert key("Kerala has high unemployment") == key("kerala has high unemployment")
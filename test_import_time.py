@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+
+# Cold import of the ASGI app must stay cheap: platform restarts make it user-visible.
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET", "1.5"))
+LAZY_MODULES = ("openai", "fastmcp", "mcp")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def _measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_sdks_are_lazy():
+    assert _measure()["loaded"] == []
+
+
+def test_import_time_budget():
+    # Best of three to keep noisy CI machines from flaking.
+    best = min(_measure()["seconds"] for _ in range(3))
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main took {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+
+
+if __name__ == "__main__":
+    print(_measure())
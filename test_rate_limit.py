@@ -0,0 +1,78 @@
+import asyncio
+import sqlite3
+
+from app.services import rate_limit
+from app.services.rate_limit import MemoryBackend, RateLimiter, SQLiteBackend, sliding_window
+
+
+def test_window_allows_up_to_the_limit():
+    state = None
+    for _ in range(3):
+        state, allowed, _ = sliding_window(state, 100.0, 3, 60.0)
+        assert allowed
+    _, allowed, retry_after = sliding_window(state, 100.0, 3, 60.0)
+    assert not allowed and retry_after == 20
+
+
+def test_previous_bucket_is_weighted_by_its_overlap():
+    # 4 hits late in the previous bucket; a quarter into the next one 3 of them still count.
+    state = (60.0, 0, 4)
+    _, allowed, _ = sliding_window(state, 135.0, 4, 60.0)
+    assert allowed
+    _, allowed, retry_after = sliding_window((120.0, 4, 1), 135.0, 4, 60.0)
+    assert not allowed and retry_after >= 1
+
+
+def test_old_state_is_reset_after_two_windows():
+    state, allowed, _ = sliding_window((0.0, 10, 10), 200.0, 1, 60.0)
+    assert allowed and state == (180.0, 0, 1)
+
+
+def test_memory_backend_evicts_least_recent_keys_over_the_cap(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 1000.0)
+    backend = MemoryBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        backend.hit(key, 5, 60.0)
+    assert len(backend) == 2 and backend.evictions == 1
+    assert list(backend._states) == ["b", "c"]
+
+
+def test_memory_backend_drops_expired_keys(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    backend = MemoryBackend(max_keys=10)
+    backend.hit("old", 5, 60.0)
+    now[0] += 180.0
+    backend.hit("new", 5, 60.0)
+    assert list(backend._states) == ["new"]
+
+
+def test_sqlite_backend_enforces_the_limit_and_prunes(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "rl.db"), max_keys=2, busy_timeout=0.05, prune_every=3)
+    assert [backend.hit("a", 2, 60.0)[0] for _ in range(3)] == [True, True, False]
+    for key in ("b", "c", "d"):
+        backend.hit(key, 2, 60.0)
+    count = backend._db().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+    assert count == 2
+
+
+def test_sqlite_backend_fails_open_when_locked(tmp_path):
+    path = str(tmp_path / "rl.db")
+    backend = SQLiteBackend(path, max_keys=10, busy_timeout=0.05)
+    backend.hit("a", 1, 60.0)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        assert backend.hit("a", 1, 60.0) == (True, 0)
+    finally:
+        other.execute("ROLLBACK")
+    assert backend.hit("a", 1, 60.0)[0] is False
+
+
+def test_limiter_tracks_api_keys_by_digest():
+    backend = MemoryBackend(max_keys=10)
+    limiter = RateLimiter(backend, window=60.0, per_ip=0, per_key=1)
+    assert asyncio.run(limiter.check_ip("1.2.3.4")) == (True, 0)
+    assert asyncio.run(limiter.check_api_key("secret"))[0]
+    assert not asyncio.run(limiter.check_api_key("secret"))[0]
+    assert all("secret" not in key for key in backend._states)
@@ -0,0 +1,39 @@
+import asyncio
+
+from app.routers import claims
+from app.services.normalizer import SeriesAccumulator
+
+MONTHLY_ROWS = [
+    {"year": str(year), "month": month, "value": float(month)} for year in (2022, 2023) for month in range(1, 13)
+]
+PAGE_SIZE = 10
+
+
+def _page(page: int) -> dict:
+    rows = MONTHLY_ROWS[(page - 1) * PAGE_SIZE : page * PAGE_SIZE]
+    return {"data": rows, "meta_data": {"totalPages": 3}}
+
+
+def _fetch_all(monkeypatch, filters: dict) -> tuple[int, bool, SeriesAccumulator]:
+    async def fake_call(client, tool, payload):
+        return _page(int(payload["filters"]["page"]))
+
+    monkeypatch.setattr(claims, "_call_tool_with_timeout", fake_call)
+    accumulator = SeriesAccumulator(claims._needed_periods(filters))
+    accumulator.add(_page(1), order=1)
+    fetched, truncated = asyncio.run(
+        claims._fetch_remaining_pages(None, "CPI", {**filters, "page": "1"}, 3, accumulator)
+    )
+    return fetched, truncated, accumulator
+
+
+def test_year_filter_on_monthly_rows_reads_every_page(monkeypatch):
+    fetched, truncated, accumulator = _fetch_all(monkeypatch, {"year": "2022,2023"})
+    assert fetched == 3 and not truncated
+    assert len(accumulator.rows) == 24
+
+
+def test_pinned_months_stop_once_covered(monkeypatch):
+    fetched, _, accumulator = _fetch_all(monkeypatch, {"year": "2022", "month_code": "3"})
+    assert fetched == 1
+    assert "2022-03" in accumulator.periods
@@ -0,0 +1,44 @@
+from app.services.step4_planner import MAX_MERGED_YEARS, plan_step4, route_rows
+
+
+def test_sets_differing_only_in_years_share_one_call():
+    plan = plan_step4(
+        {"primary": [{"state": "1", "year": "2021,2022"}], "benchmark": [{"state": "1", "year": "2023"}]}
+    )
+    assert len(plan) == 1
+    assert plan[0].filters == {"state": "1", "year": "2021,2022,2023"}
+    assert plan[0].targets == [("primary", 0), ("benchmark", 0)]
+
+
+def test_merged_year_list_is_capped():
+    years = [str(year) for year in range(2015, 2015 + MAX_MERGED_YEARS)]
+    plan = plan_step4(
+        {"primary": [{"state": "1", "year": ",".join(years)}], "benchmark": [{"state": "1", "year": "2024"}]}
+    )
+    assert len(plan) == 2
+
+
+def test_other_filters_keep_calls_apart():
+    plan = plan_step4({"primary": [{"state": "1", "year": "2022"}], "benchmark": [{"state": "2", "year": "2022"}]})
+    assert [call.filters["state"] for call in plan] == ["1", "2"]
+
+
+def test_sets_without_years_merge_only_when_identical():
+    plan = plan_step4({"primary": [{"state": "1"}, {"state": "1"}, {"state": "2"}]})
+    assert [call.targets for call in plan] == [[("primary", 0), ("primary", 1)], [("primary", 2)]]
+
+
+def test_executed_call_serves_subsumed_sets_without_widening():
+    executed = [{"state": "1", "year": "2021,2022"}]
+    plan = plan_step4({"primary": [{"state": "1", "year": "2022"}, {"state": "1", "year": "2023"}]}, executed)
+    done = [call for call in plan if call.done]
+    fresh = [call for call in plan if not call.done]
+    assert done[0].filters == {"state": "1", "year": "2021,2022"} and done[0].targets == [("primary", 0)]
+    assert fresh[0].filters == {"state": "1", "year": "2023"} and fresh[0].targets == [("primary", 1)]
+
+
+def test_rows_are_routed_back_to_their_own_years():
+    rows = [{"year": "2021", "value": 1}, {"year": "2023", "value": 2}, {"value": 3}]
+    routed = route_rows(rows, {"year": "2021"}, {"year": "2021,2023"})
+    assert [row["value"] for row in routed] == [1, 3]
+    assert route_rows(rows, {"year": "2021,2023"}, {"year": "2021,2023"}) is rows
@@ -0,0 +1,50 @@
+import datetime
+
+from app.services.time_scope import apply_time_scope, parse_time_scope
+
+TODAY = datetime.date(2026, 6, 1)
+STEP3 = {"api_params": [{"name": "year"}]}
+
+
+def test_last_n_years_covers_exactly_n_years():
+    scope = parse_time_scope("Prices rose over the last 3 years", TODAY)
+    assert scope.kind == "last"
+    assert scope.years == [2024, 2025, 2026]
+
+
+def test_relative_window_moves_back_to_latest_published_year():
+    scope = parse_time_scope("Unemployment fell over the past three years", TODAY)
+    pinned = apply_time_scope({"year": "2024"}, scope, STEP3)
+    assert pinned["year"] == "2022,2023,2024"
+
+
+def test_relative_window_anchors_on_available_years():
+    step3 = {**STEP3, "data": {"year": [{"year": str(year)} for year in range(2018, 2025)]}}
+    scope = parse_time_scope("Unemployment fell over the last 3 years", TODAY)
+    assert apply_time_scope({"year": "2024"}, scope, step3)["year"] == "2022,2023,2024"
+
+
+def test_since_clamps_only_the_end_year():
+    scope = parse_time_scope("Inflation has doubled since 2019", TODAY)
+    pinned = apply_time_scope({"year": "2024"}, scope, STEP3)
+    years = pinned["year"].split(",")
+    assert years[0] == "2019" and years[-1] == "2024"
+
+
+def test_since_with_words_before_the_year_is_a_span():
+    scope = parse_time_scope("GDP has grown fivefold since the 1991 reforms", TODAY)
+    assert scope.kind == "since"
+    assert scope.years[0] == 1991 and scope.years[-1] == 2026
+    assert len(scope.years) == 5
+
+
+def test_since_with_a_short_phrase_before_the_year():
+    scope = parse_time_scope("Poverty has fallen since the crisis of 2008", TODAY)
+    assert scope.kind == "since"
+    assert scope.years[0] == 2008
+
+
+def test_explicit_year_stays_explicit():
+    scope = parse_time_scope("CPI inflation was 5% in 2023", TODAY)
+    assert scope.kind == "explicit"
+    assert scope.years == [2023]
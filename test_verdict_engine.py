@@ -0,0 +1,58 @@
+from app.services.verdict_engine import evaluate_claim
+
+FALLING = [{"year": str(year), "value": 10.0 - (year - 2019)} for year in range(2019, 2025)]
+RISING = [{"year": str(year), "value": 100.0 + 10 * (year - 2019)} for year in range(2019, 2025)]
+
+
+def test_growth_slowing_is_left_to_the_interpreter():
+    assert evaluate_claim("GDP growth is slowing", "trend", FALLING, None, "GDP") is None
+
+
+def test_growth_stalled_is_left_to_the_interpreter():
+    assert evaluate_claim("Industrial growth has stalled", "trend", FALLING, None, "IIP") is None
+
+
+def test_growth_rising_is_not_scored_against_the_level_series():
+    assert evaluate_claim("GDP growth has risen since 2019", "trend", RISING, None, "GDP") is None
+
+
+def test_verb_forms_of_grow_still_read_as_up():
+    result = evaluate_claim("Wages grew between 2019 and 2024", "trend", RISING, None, "Wages")
+    assert result is not None and result["verdict"] == "confirmed"
+
+
+def test_falling_series_busts_a_rise_claim():
+    result = evaluate_claim("Unemployment has risen since 2019", "trend", FALLING, None, "UR")
+    assert result is not None and result["verdict"] == "busted"
+
+
+def test_inflation_direction_is_not_read_off_the_index_level():
+    assert evaluate_claim("Inflation has fallen since 2022", "trend", RISING, None, "CPI") is None
+    assert evaluate_claim("Inflation is rising", "trend", RISING, None, "CPI") is None
+
+
+def test_comparison_with_a_past_period_is_left_to_the_interpreter():
+    assert evaluate_claim("Prices were lower in 2019", "trend", RISING, None, "CPI") is None
+    assert evaluate_claim("Prices were lower 5 years ago", "trend", RISING, None, "CPI") is None
+
+
+def test_higher_than_a_number_is_not_a_trend():
+    rate = [{"year": str(year), "value": 4.2} for year in range(2021, 2025)]
+    assert evaluate_claim("Unemployment is higher than 5%", "level", rate, None, "Unemployment rate") is None
+
+
+def test_percent_threshold_is_checked_against_a_rate():
+    rate = [{"year": str(year), "value": 4.2} for year in range(2021, 2025)]
+    result = evaluate_claim("Unemployment is above 5%", "level", rate, None, "Unemployment rate")
+    assert result is not None and result["verdict"] == "busted"
+
+
+def test_threshold_with_a_scale_word_is_left_to_the_interpreter():
+    gdp = [{"year": str(year), "value": 25_000_000.0 + year} for year in range(2021, 2025)]
+    assert evaluate_claim("GDP is more than 5 trillion dollars", "level", gdp, None, "GDP") is None
+    rate = [{"year": str(year), "value": 4.5} for year in range(2021, 2025)]
+    assert evaluate_claim("Over 3 crore people are unemployed", "level", rate, None, "Unemployment rate") is None
+
+
+def test_percent_threshold_is_not_checked_against_an_index():
+    assert evaluate_claim("CPI is above 5%", "level", RISING, None, "CPI") is None